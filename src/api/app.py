@@ -1,17 +1,24 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Query
 from sqlmodel import Session, select
+from sqlalchemy import func
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 import pandas as pd
 import json
 import logging
+import threading
+import uuid
 from datetime import date
 
 import src.core.db
 from src.core.db import get_session, create_db_and_tables
-from src.core.models import Player, PlayerStats, FantasyTeam, TeamRoster, League, DailyStandings, AgentTask
+from src.core.models import (
+    Player, PlayerSeasonTotals, FantasyTeam, TeamRoster, League, DailyStandings, AgentTask
+)
 from src.core.stats import aggregate_player_stats, calculate_z_scores
+from src.core.totals import DEFAULT_SEASON, TOTAL_COLUMNS, fetch_season_totals
 from src.core.analyzer import TradeAnalyzer
 from src.core.recommender import recommend_daily_lineup
 from src.core.supervisor import Supervisor
@@ -45,6 +52,8 @@ class TradeRequest(BaseModel):
     team_b_id: Optional[int] = None
     players_to_b: List[int]
     players_to_a: List[int]
+    # Defaults to the season of team_a's (else team_b's) league
+    season: Optional[str] = None
 
 class IngestionRequest(BaseModel):
     days: int = 15
@@ -85,9 +94,59 @@ class RosterImportRequest(BaseModel):
     roster_map: Dict[str, List[str]]
 
 class TaskResponse(BaseModel):
-    task_id: str
+    task_id: uuid.UUID
     status: str
 
+# LRU of computed Z-score frames keyed by (totals fingerprint, season, player set).
+# Sync endpoints run in FastAPI's threadpool, so every access holds the lock
+Z_SCORE_CACHE_SIZE = 64
+_z_score_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_z_score_cache_lock = threading.Lock()
+
+def _totals_fingerprint(session: Session, season: str) -> tuple:
+    """
+    Row count and column sums of the season's PlayerSeasonTotals, the table the
+    cached frames are computed from. Changes on ingest and also when totals are
+    rebuilt or corrected in place (one pass over ~one row per player).
+    """
+    return tuple(session.exec(
+        select(
+            func.count(),
+            func.sum(PlayerSeasonTotals.games),
+            *[func.sum(getattr(PlayerSeasonTotals, col)) for col in TOTAL_COLUMNS.values()],
+        ).where(PlayerSeasonTotals.season == season)
+    ).one())
+
+def player_z_scores(
+    session: Session,
+    player_ids: Optional[List[int]] = None,
+    season: str = DEFAULT_SEASON,
+) -> pd.DataFrame:
+    """
+    Per-player averages + Z-scores, memoized until the season's totals change.
+    Returns a copy so callers can add columns freely.
+    """
+    key = (
+        _totals_fingerprint(session, season),
+        season,
+        tuple(sorted(set(player_ids))) if player_ids is not None else None,
+    )
+    with _z_score_cache_lock:
+        df_z = _z_score_cache.get(key)
+        if df_z is not None:
+            _z_score_cache.move_to_end(key)
+            return df_z.copy()
+    
+    totals = fetch_season_totals(session, season, player_ids)
+    if not totals:
+        return pd.DataFrame()
+    df_z = calculate_z_scores(aggregate_player_stats(totals, precomputed=True))
+    with _z_score_cache_lock:
+        _z_score_cache[key] = df_z
+        if len(_z_score_cache) > Z_SCORE_CACHE_SIZE:
+            _z_score_cache.popitem(last=False)
+    return df_z.copy()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Fantasy NBA Assistant"}
@@ -127,7 +186,7 @@ def get_standings(league_id: int, background_tasks: BackgroundTasks, session: Se
     return sorted(standings, key=lambda x: (x.date, x.rank), reverse=True)
 
 @app.get("/tasks/{task_id}", response_model=AgentTask)
-def get_task_status(task_id: str, session: Session = Depends(get_session)):
+def get_task_status(task_id: uuid.UUID, session: Session = Depends(get_session)):
     task = session.get(AgentTask, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -287,15 +346,17 @@ def get_player_detail(player_id: int, session: Session = Depends(get_session)):
     return combined_data
 
 @app.get("/stats")
-def get_stats(session: Session = Depends(get_session)):
-    stats = session.exec(select(PlayerStats)).all()
-    if not stats:
-        return []
-    data = [s.model_dump() for s in stats]
-    df_agg = aggregate_player_stats(data)
+def get_stats(
+    session: Session = Depends(get_session),
+    top_n: Optional[int] = Query(None, ge=1),
+    season: str = DEFAULT_SEASON,
+):
+    # Same season totals as the trade/lineup endpoints, so Z-scores agree
+    totals = fetch_season_totals(session, season)
+    df_agg = aggregate_player_stats(totals, precomputed=True)
     if df_agg.empty:
         return []
-    df_z = calculate_z_scores(df_agg)
+    df_z = calculate_z_scores(df_agg, top_n=top_n)
     players = session.exec(select(Player)).all()
     p_map = {p.id: p.full_name for p in players}
     df_z['full_name'] = df_z['player_id'].map(p_map)
@@ -368,25 +429,21 @@ def add_player_to_team(team_id: int, player: PlayerAdd, session: Session = Depen
 
 @app.post("/analyze/trade")
 def analyze_trade(req: TradeRequest, session: Session = Depends(get_session)):
-    stats = session.exec(select(PlayerStats)).all()
-    if not stats:
-        raise HTTPException(status_code=400, detail="No stats available. Run ingestion first.")
-    data = [s.model_dump() for s in stats]
-    df_agg = aggregate_player_stats(data)
-    df_z = calculate_z_scores(df_agg)
+    team_a = session.get(FantasyTeam, req.team_a_id) if req.team_a_id else None
+    team_b = session.get(FantasyTeam, req.team_b_id) if req.team_b_id else None
+    
+    season = req.season
+    if season is None:
+        league = next((team.league for team in (team_a, team_b) if team and team.league), None)
+        season = league.season if league else DEFAULT_SEASON
     
-    roster_a = req.team_a_roster
-    roster_b = req.team_b_roster
+    df_z = player_z_scores(session, season=season)
+    if df_z.empty:
+        raise HTTPException(status_code=400, detail=f"No stats available for {season}. Run ingestion first.")
+    
+    roster_a = [p.id for p in team_a.players] if team_a else req.team_a_roster
+    roster_b = [p.id for p in team_b.players] if team_b else req.team_b_roster
     
-    if req.team_a_id:
-        team_a = session.get(FantasyTeam, req.team_a_id)
-        if team_a:
-            roster_a = [p.id for p in team_a.players]
-    if req.team_b_id:
-        team_b = session.get(FantasyTeam, req.team_b_id)
-        if team_b:
-            roster_b = [p.id for p in team_b.players]
-            
     if not roster_a or not roster_b:
         raise HTTPException(status_code=400, detail="Must provide either roster IDs or valid team IDs")
     
@@ -400,13 +457,14 @@ def analyze_trade(req: TradeRequest, session: Session = Depends(get_session)):
     return result
 
 @app.post("/recommend/lineup")
-def recommend_lineup(roster_ids: List[int], session: Session = Depends(get_session)):
-    stats = session.exec(select(PlayerStats).where(PlayerStats.player_id.in_(roster_ids))).all()
-    if not stats:
+def recommend_lineup(
+    roster_ids: List[int],
+    session: Session = Depends(get_session),
+    season: str = DEFAULT_SEASON,
+):
+    df_z = player_z_scores(session, roster_ids, season)
+    if df_z.empty:
          return {"message": "No data for these players"}
-    data = [s.model_dump() for s in stats]
-    df_agg = aggregate_player_stats(data)
-    df_z = calculate_z_scores(df_agg)
     players = session.exec(select(Player).where(Player.id.in_(roster_ids))).all()
     p_map = {p.id: p.full_name for p in players}
     df_z['full_name'] = df_z['player_id'].map(p_map)
@@ -0,0 +1,94 @@
+"""
+Bulk write helpers for high-volume ingest tables.
+
+These bypass ORM object construction and identity-map bookkeeping and go
+straight to Core executemany inserts.
+"""
+
+from typing import Any, Dict, List
+import io
+import logging
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from src.core.models import PlayerStats, TeamRoster
+from src.core.totals import dialect_insert, upsert_season_totals
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany round trip / commit
+BULK_CHUNK_SIZE = 500
+
+# Below this many rows a plain executemany beats the COPY setup cost
+COPY_THRESHOLD = 100
+
+
+def bulk_insert_playerstats(
+    session: Session,
+    rows: List[Dict[str, Any]],
+    season: str,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """
+    Insert PlayerStats rows (plain dicts) in chunks and fold them into season totals.
+
+    Games already stored are skipped by the database (ON CONFLICT DO NOTHING
+    on player_id + game_id), so callers don't need to preload existing keys.
+    Only rows actually inserted (per RETURNING) are added to the totals, and
+    each chunk commits together with its PlayerSeasonTotals upsert so totals
+    never drift from the game rows.
+
+    Returns:
+        Number of rows inserted
+    """
+    table = PlayerStats.__table__
+    stmt = (
+        dialect_insert(session)(table)
+        .on_conflict_do_nothing(index_elements=['player_id', 'game_id'])
+        .returning(table.c.player_id, table.c.game_id)
+    )
+
+    inserted_total = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        inserted = set(session.exec(stmt, params=chunk).all())
+        upsert_season_totals(
+            session,
+            (row for row in chunk if (row['player_id'], row['game_id']) in inserted),
+            season,
+        )
+        session.commit()
+        inserted_total += len(inserted)
+        logger.debug(f"Bulk inserted {len(inserted)} of {len(chunk)} stats rows")
+    return inserted_total
+
+
+def bulk_insert_team_rosters(session: Session, rows: List[Dict[str, int]]) -> int:
+    """
+    Insert TeamRoster link rows ({team_id, player_id} dicts).
+
+    On PostgreSQL, batches of COPY_THRESHOLD rows or more are streamed with
+    COPY FROM; smaller batches and other dialects use one executemany. Runs
+    in the session's transaction; the caller commits.
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    if session.bind.dialect.name == 'postgresql' and len(rows) >= COPY_THRESHOLD:
+        buffer = io.StringIO(
+            ''.join(f"{row['team_id']}\t{row['player_id']}\n" for row in rows)
+        )
+        # psycopg2 cursor on the session's own connection/transaction
+        with session.connection().connection.cursor() as cursor:
+            cursor.copy_from(
+                buffer, TeamRoster.__tablename__, sep='\t', columns=('team_id', 'player_id')
+            )
+    else:
+        session.exec(insert(TeamRoster), params=rows)
+
+    logger.debug(f"Bulk inserted {len(rows)} roster rows")
+    return len(rows)
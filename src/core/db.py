@@ -4,6 +4,8 @@ from sqlalchemy import event
 import os
 import logging
 
+from src.core.totals import backfill_season_totals
+
 logger = logging.getLogger(__name__)
 
 def get_database_url() -> str:
@@ -47,6 +49,15 @@ def create_engine_with_retry(url: str, max_retries: int = 3):
     def on_checkout(dbapi_conn, connection_record, connection_proxy):
         logger.debug("Connection checked out from pool")
     
+    if engine.dialect.name == "sqlite":
+        # WAL + NORMAL sync makes bulk ingest commits far cheaper on SQLite
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+    
     return engine
 
 # Lazy initialization to allow testing with different engines
@@ -77,6 +88,10 @@ def create_db_and_tables():
     if engine is None:
         raise RuntimeError("Database engine not initialized. Set DATABASE_URL.")
     SQLModel.metadata.create_all(engine)
+    
+    # Databases created before PlayerSeasonTotals existed have games but no totals
+    with Session(engine) as session:
+        backfill_season_totals(session)
 
 def get_session():
     """Dependency injection for FastAPI - yields a database session."""
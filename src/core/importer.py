@@ -1,14 +1,23 @@
 from typing import Dict, List, Any, Optional
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 from src.core.models import League, FantasyTeam, Player
-import difflib
+from rapidfuzz import fuzz
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
 
+def _trigrams(text: str) -> List[str]:
+    """Character trigrams of a space-padded string (short names still yield some)."""
+    padded = f" {text} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
 class ImportSource(Enum):
     """Source of roster import data."""
     MANUAL = "manual"  # JSON/manual input with fuzzy matching
@@ -53,10 +62,17 @@ class RosterImporter:
     
     # Configurable matching threshold (0.0 to 1.0)
     FUZZY_MATCH_CUTOFF = 0.8
+    # Number of trigram-overlap candidates to score with the fuzzy matcher
+    FUZZY_CANDIDATES = 50
     
     def __init__(self, session: Session):
         self.session = session
         self._players_cache: Optional[Dict[str, Player]] = None
+        self._choices_list: List[str] = []
+        self._players_list: List[Player] = []
+        self._trigram_index: Dict[str, List[int]] = {}
+        # Fuzzy results per cleaned name, so repeated names in a batch match once
+        self._fuzzy_cache: Dict[str, Optional[Player]] = {}
 
     @property
     def players_cache(self) -> Dict[str, Player]:
@@ -70,7 +86,19 @@ class RosterImporter:
         players = self.session.exec(
             select(Player).where(Player.is_active == True)
         ).all()
-        cache = {p.full_name.lower(): p for p in players}
+        # Interned keys let exact-hit lookups short-circuit on identity
+        cache = {sys.intern(p.full_name.lower()): p for p in players}
+        # Parallel lists for the fuzzy scan (index-aligned)
+        self._choices_list = list(cache.keys())
+        self._players_list = list(cache.values())
+        
+        # Inverted trigram index for shortlisting fuzzy candidates
+        trigram_index: Dict[str, List[int]] = defaultdict(list)
+        for idx, choice in enumerate(self._choices_list):
+            for gram in set(_trigrams(choice)):
+                trigram_index[gram].append(idx)
+        self._trigram_index = dict(trigram_index)
+        self._fuzzy_cache = {}
         logger.debug(f"Loaded {len(cache)} players into matching cache")
         return cache
 
@@ -87,27 +115,39 @@ class RosterImporter:
         if not name or not name.strip():
             return None
             
-        name_clean = name.strip().lower()
+        name_clean = sys.intern(name.strip().lower())
         
         # 1. Exact Match
         if name_clean in self.players_cache:
             logger.debug(f"Exact match found for '{name}'")
             return self.players_cache[name_clean]
         
-        # 2. Fuzzy Match
-        matches = difflib.get_close_matches(
-            name_clean, 
-            self.players_cache.keys(), 
-            n=1, 
-            cutoff=self.FUZZY_MATCH_CUTOFF
-        )
-        if matches:
-            matched_name = matches[0]
-            logger.debug(f"Fuzzy match: '{name}' -> '{matched_name}'")
-            return self.players_cache[matched_name]
+        if name_clean in self._fuzzy_cache:
+            return self._fuzzy_cache[name_clean]
+        
+        # 2. Fuzzy Match - shortlist by trigram overlap, then keep a running best
+        overlap = Counter()
+        for gram in set(_trigrams(name_clean)):
+            overlap.update(self._trigram_index.get(gram, ()))
         
-        logger.debug(f"No match found for '{name}'")
-        return None
+        threshold = self.FUZZY_MATCH_CUTOFF * 100
+        best_score, best_idx = -1.0, None
+        for idx, _ in overlap.most_common(self.FUZZY_CANDIDATES):
+            score = fuzz.ratio(name_clean, self._choices_list[idx], score_cutoff=threshold)
+            if score > best_score:
+                best_score, best_idx = score, idx
+                if score >= 99:
+                    break  # Near-exact hit, nothing can beat it meaningfully
+        
+        match = None
+        if best_idx is not None and best_score >= threshold:
+            logger.debug(f"Fuzzy match: '{name}' -> '{self._choices_list[best_idx]}'")
+            match = self._players_list[best_idx]
+        else:
+            logger.debug(f"No match found for '{name}'")
+        
+        self._fuzzy_cache[name_clean] = match
+        return match
 
     def validate_roster_map(self, roster_map: Dict[str, List[str]]) -> List[str]:
         """
@@ -172,21 +212,31 @@ class RosterImporter:
         logger.info(f"Starting roster import for league '{league.name}' (ID: {league_id})")
         
         try:
+            # Load the league's existing teams (and their rosters) for this map in
+            # one query rather than a lookup per team
+            stmt = (
+                select(FantasyTeam)
+                .where(
+                    FantasyTeam.league_id == league_id,
+                    FantasyTeam.name.in_([name.strip() for name in roster_map]),
+                )
+                .options(selectinload(FantasyTeam.players))
+                .order_by(FantasyTeam.id)
+            )
+            teams_by_name: Dict[str, FantasyTeam] = {}
+            for existing in self.session.exec(stmt).all():
+                teams_by_name.setdefault(existing.name, existing)
+            
             for team_name, player_names in roster_map.items():
                 team_name = team_name.strip()
                 
                 # Find or Create Team
-                stmt = select(FantasyTeam).where(
-                    FantasyTeam.name == team_name,
-                    FantasyTeam.league_id == league_id
-                )
-                team = self.session.exec(stmt).first()
+                team = teams_by_name.get(team_name)
                 
                 if not team:
                     team = FantasyTeam(name=team_name, league_id=league_id)
                     self.session.add(team)
-                    # Flush to get ID for relationship management
-                    self.session.flush()
+                    teams_by_name[team_name] = team
                     report.teams_created += 1
                     logger.debug(f"Created team: {team_name}")
                 else:
@@ -218,8 +268,6 @@ class RosterImporter:
                             "team": team_name, 
                             "player": player_name.strip()
                         })
-                
-                self.session.add(team)
             
             self.session.commit()
             logger.info(
@@ -233,6 +281,9 @@ class RosterImporter:
             report.success = False
             logger.error(f"Import failed, rolled back: {e}")
             raise ImportError(f"Import failed: {e}") from e
+        finally:
+            # Matched ORM objects must not outlive this import's transaction
+            self._fuzzy_cache.clear()
         
         return report
 
@@ -362,8 +413,6 @@ class RosterImporter:
                             "player": player_name,
                             "espn_id": espn_player_id,
                         })
-                
-                self.session.add(team)
             
             self.session.commit()
             logger.info(
@@ -377,6 +426,9 @@ class RosterImporter:
             report.success = False
             logger.error(f"ESPN import failed, rolled back: {e}")
             raise ImportError(f"ESPN import failed: {e}") from e
+        finally:
+            # Matched ORM objects must not outlive this import's transaction
+            self._fuzzy_cache.clear()
         
         return report
 
@@ -1,13 +1,19 @@
 from typing import Optional, List, Dict, Any
 from sqlmodel import Field, SQLModel, Relationship, JSON, UniqueConstraint
-from sqlalchemy import Index
-from datetime import date, datetime, timezone
+from sqlalchemy import CheckConstraint, DateTime, Index, SmallInteger, func
+from datetime import date, datetime
 import uuid
 
 
-def utc_now() -> datetime:
-    """Return current UTC time as timezone-aware datetime."""
-    return datetime.now(timezone.utc)
+def server_timestamp(onupdate: bool = False) -> Any:
+    """
+    Timestamp field filled in by the database (func.now()) instead of per row in Python.
+    The attribute is None until the row is flushed and refreshed.
+    """
+    column_kwargs = {"server_default": func.now(), "nullable": False}
+    if onupdate:
+        column_kwargs["onupdate"] = func.now()
+    return Field(default=None, sa_type=DateTime(timezone=True), sa_column_kwargs=column_kwargs)
 
 
 # Link table for Many-to-Many relationship
@@ -17,7 +23,7 @@ class TeamRoster(SQLModel, table=True):
     
     team_id: Optional[int] = Field(default=None, foreign_key="fantasyteam.id", primary_key=True)
     player_id: Optional[int] = Field(default=None, foreign_key="player.id", primary_key=True)
-    added_at: datetime = Field(default_factory=utc_now)
+    added_at: Optional[datetime] = server_timestamp()
 
 
 class League(SQLModel, table=True):
@@ -25,8 +31,8 @@ class League(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     season: str = "2024-25"
-    created_at: datetime = Field(default_factory=utc_now)
-    updated_at: datetime = Field(default_factory=utc_now)
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(onupdate=True)
     
     # ESPN integration fields
     espn_league_id: Optional[int] = Field(default=None, index=True)  # ESPN league ID
@@ -55,6 +61,10 @@ class Player(SQLModel, table=True):
     teams: List["FantasyTeam"] = Relationship(back_populates="players", link_model=TeamRoster)
 
 
+# Counting stat columns on PlayerStats
+STAT_COLUMNS = ("pts", "reb", "ast", "stl", "blk", "fgm", "fga", "ftm", "fta", "tpm", "tov")
+
+
 class PlayerStats(SQLModel, table=True):
     """Individual game statistics for a player."""
     __tablename__ = "playerstats"
@@ -63,6 +73,21 @@ class PlayerStats(SQLModel, table=True):
         UniqueConstraint("player_id", "game_id", name="uq_player_game"),
         # Composite index for common query patterns
         Index("ix_playerstats_player_date", "player_id", "game_date"),
+        # Covering index so per-player stat aggregation can be served index-only.
+        # Postgres uses INCLUDE; SQLite has no INCLUDE, so it gets a wide composite.
+        Index(
+            "ix_playerstats_covering", "player_id",
+            postgresql_include=list(STAT_COLUMNS),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_playerstats_covering", "player_id", *STAT_COLUMNS,
+        ).ddl_if(dialect="sqlite"),
+        # Counting stats are non-negative; enforced once by the DB instead of per-field validators
+        CheckConstraint(
+            "pts >= 0 AND reb >= 0 AND ast >= 0 AND stl >= 0 AND blk >= 0 AND fgm >= 0 "
+            "AND fga >= 0 AND ftm >= 0 AND fta >= 0 AND tpm >= 0 AND tov >= 0",
+            name="ck_playerstats_nonneg",
+        ),
     )
     
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -70,20 +95,43 @@ class PlayerStats(SQLModel, table=True):
     game_date: date = Field(index=True)
     game_id: str = Field(index=True)
     matchup: str
-    pts: int = Field(default=0, ge=0)  # Greater than or equal to 0
-    reb: int = Field(default=0, ge=0)
-    ast: int = Field(default=0, ge=0)
-    stl: int = Field(default=0, ge=0)
-    blk: int = Field(default=0, ge=0)
-    fgm: int = Field(default=0, ge=0)
-    fga: int = Field(default=0, ge=0)
-    ftm: int = Field(default=0, ge=0)
-    fta: int = Field(default=0, ge=0)
-    tpm: int = Field(default=0, ge=0)
-    tov: int = Field(default=0, ge=0)
+    # Per-game counters all fit in 2 bytes
+    pts: int = Field(default=0, sa_type=SmallInteger)
+    reb: int = Field(default=0, sa_type=SmallInteger)
+    ast: int = Field(default=0, sa_type=SmallInteger)
+    stl: int = Field(default=0, sa_type=SmallInteger)
+    blk: int = Field(default=0, sa_type=SmallInteger)
+    fgm: int = Field(default=0, sa_type=SmallInteger)
+    fga: int = Field(default=0, sa_type=SmallInteger)
+    ftm: int = Field(default=0, sa_type=SmallInteger)
+    fta: int = Field(default=0, sa_type=SmallInteger)
+    tpm: int = Field(default=0, sa_type=SmallInteger)
+    tov: int = Field(default=0, sa_type=SmallInteger)
     
     player: Player = Relationship(back_populates="stats")
 
+class PlayerSeasonTotals(SQLModel, table=True):
+    """
+    Running per-player season sums, maintained incrementally as PlayerStats
+    rows are ingested so aggregation does not re-scan every game.
+    """
+    __tablename__ = "playerseasontotals"
+    
+    player_id: int = Field(foreign_key="player.id", primary_key=True)
+    season: str = Field(default="2024-25", primary_key=True)
+    games: int = 0
+    sum_pts: int = 0
+    sum_reb: int = 0
+    sum_ast: int = 0
+    sum_stl: int = 0
+    sum_blk: int = 0
+    sum_fgm: int = 0
+    sum_fga: int = 0
+    sum_ftm: int = 0
+    sum_fta: int = 0
+    sum_tpm: int = 0
+    sum_tov: int = 0
+
 class FantasyTeam(SQLModel, table=True):
     """Fantasy team with optional ESPN integration."""
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -99,6 +147,13 @@ class FantasyTeam(SQLModel, table=True):
     daily_standings: List["DailyStandings"] = Relationship(back_populates="team")
 
 class DailyStandings(SQLModel, table=True):
+    __table_args__ = (
+        # Latest standings for a team
+        Index("ix_dailystandings_team_date", "team_id", "date"),
+        # League leaderboard on a date
+        Index("ix_dailystandings_league_date_rank", "league_id", "date", "rank"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     team_id: int = Field(foreign_key="fantasyteam.id")
     league_id: int = Field(foreign_key="league.id")
@@ -134,20 +189,21 @@ class DailyStandings(SQLModel, table=True):
 # --- Supervisor / Agent Models ---
 
 class AgentTask(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # Native UUID (16 bytes) rather than a 36-char string key
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     task_type: str  # e.g., "calculate_roto", "import_roster"
     status: str = "pending" # pending, running, completed, failed
     payload: Dict = Field(default={}, sa_type=JSON)
     result: Dict = Field(default={}, sa_type=JSON)
     error: Optional[str] = None
-    created_at: datetime = Field(default_factory=utc_now)
-    updated_at: datetime = Field(default_factory=utc_now)
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(onupdate=True)
 
 class AuditLog(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    task_id: Optional[str] = Field(default=None, foreign_key="agenttask.id")
+    task_id: Optional[uuid.UUID] = Field(default=None, foreign_key="agenttask.id")
     entity_type: str # "League", "Team"
     entity_id: int
     action: str # "update_roster", "calculate_standings"
-    timestamp: datetime = Field(default_factory=utc_now)
+    timestamp: Optional[datetime] = server_timestamp()
     details: Dict = Field(default={}, sa_type=JSON)
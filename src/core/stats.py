@@ -1,67 +1,110 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from src.core.models import STAT_COLUMNS
 
-def calculate_z_scores(df: pd.DataFrame, categories: List[str] = None):
+# Raw per-game counting columns as stored on PlayerStats
+RAW_STAT_COLUMNS = list(STAT_COLUMNS)
+# The same columns as summed on PlayerSeasonTotals
+SUM_COLUMNS = [f'sum_{col}' for col in RAW_STAT_COLUMNS]
+
+# Identifier columns carried through to Z-score output when present
+ID_COLUMNS = ['player_id', 'full_name', 'PLAYER_NAME', 'games']
+
+def _zscore_kernel(vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column-wise Z-scores of a players x categories float64 matrix.
+    Returns (z matrix, per-row mean of z). Constant columns score 0.
+    """
+    # Population (ddof=0) moments from sum and sum of squares in one pass
+    n = vals.shape[0]
+    mu = vals.sum(axis=0) / n
+    var = (vals * vals).sum(axis=0) / n - mu * mu
+    sd = np.sqrt(np.maximum(var, 0.0))
+    # sumsq cancellation leaves ~sqrt(eps)*|mu| noise on constant columns
+    sd[sd <= 1e-7 * np.maximum(np.abs(mu), 1.0)] = 0.0
+    # Avoid division by zero
+    sd_safe = np.where(sd == 0, 1.0, sd)
+    z = (vals - mu) / sd_safe
+    z[:, sd == 0] = 0.0
+    return z, z.mean(axis=1)
+
+def calculate_z_scores(df: pd.DataFrame, categories: List[str] = None, top_n: Optional[int] = None):
     """
     Calculates Z-scores for the given dataframe of player averages.
     df: DataFrame with player names and stats columns.
     categories: List of categories to calculate Z-scores for (default 8-cat).
+    top_n: If set, return only the top N players by z_total (partial selection, no full sort).
     """
     if categories is None:
         categories = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'FG_PCT', 'FT_PCT']
         
-    stats_df = df.copy()
+    # Copy only identifiers + categories rather than the whole input frame
+    keep = [c for c in ID_COLUMNS if c in df.columns] + categories
+    stats_df = df[keep].copy()
     
-    # Calculate averages and std dev for the population
-    means = stats_df[categories].mean()
-    stds = stats_df[categories].std()
+    z, z_total = _zscore_kernel(stats_df[categories].to_numpy(dtype=np.float64))
     
-    z_score_cols = []
-    for cat in categories:
-        col_name = f"z_{cat}"
-        z_score_cols.append(col_name)
-        # Avoid division by zero
-        if stds[cat] == 0:
-            stats_df[col_name] = 0.0
-        else:
-            stats_df[col_name] = (stats_df[cat] - means[cat]) / stds[cat]
-            
-    # Calculate Total Z-score (average of z-scores)
-    stats_df['z_total'] = stats_df[z_score_cols].mean(axis=1)
+    z_score_cols = [f"z_{cat}" for cat in categories]
+    stats_df[z_score_cols] = z
+    # Total Z-score (average of z-scores)
+    stats_df['z_total'] = z_total
     
+    if top_n is not None:
+        return stats_df.nlargest(top_n, 'z_total')
     return stats_df.sort_values(by='z_total', ascending=False)
 
-def aggregate_player_stats(stats_data: List[Dict]):
+def _per_game_averages(sums: pd.DataFrame) -> pd.DataFrame:
+    """Turns per-player season sums (raw column names + games) into 8-cat averages."""
+    # Vectorized percentages (0 when no attempts)
+    fga = sums['fga'].to_numpy()
+    fta = sums['fta'].to_numpy()
+    sums['FG_PCT'] = np.where(fga > 0, sums['fgm'].to_numpy() / np.where(fga == 0, 1, fga), 0.0)
+    sums['FT_PCT'] = np.where(fta > 0, sums['ftm'].to_numpy() / np.where(fta == 0, 1, fta), 0.0)
+    
+    # Rename columns to match standard 8-cat headers expected
+    sums = sums.rename(columns={
+        'pts': 'PTS', 'reb': 'REB', 'ast': 'AST', 
+        'stl': 'STL', 'blk': 'BLK', 'tpm': 'FG3M'
+    })
+    
+    # Since we summed, we need averages for counting stats? 
+    # Actually for Z-scores usually we use per-game averages.
+    counting = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M']
+    sums[counting] = sums[counting].to_numpy(dtype=np.float64) / sums['games'].to_numpy()[:, None]
+    return sums
+
+def aggregate_player_stats(stats_data: List[Dict], precomputed: bool = False):
     """
     Aggregates a list of stat dictionaries (from DB) into per-player averages.
+    precomputed: stats_data are PlayerSeasonTotals rows (sum_* columns + games)
+                 rather than per-game PlayerStats rows, so no groupby is needed.
     """
     if not stats_data:
         return pd.DataFrame()
-        
-    df = pd.DataFrame(stats_data)
     
-    # Check if we have percent categories, if not calculate them from FGM/FGA etc
-    if 'FG_PCT' not in df.columns:
-        # Sum totals first
-        sums = df.groupby('player_id').sum(numeric_only=True).reset_index()
-        sums['FG_PCT'] = sums.apply(lambda x: x['fgm']/x['fga'] if x['fga'] > 0 else 0, axis=1)
-        sums['FT_PCT'] = sums.apply(lambda x: x['ftm']/x['fta'] if x['fta'] > 0 else 0, axis=1)
-        
-        # Rename columns to match standard 8-cat headers expected
-        sums = sums.rename(columns={
-            'pts': 'PTS', 'reb': 'REB', 'ast': 'AST', 
-            'stl': 'STL', 'blk': 'BLK', 'tpm': 'FG3M'
-        })
-        
-        # Since we summed, we need averages for counting stats? 
-        # Actually for Z-scores usually we use per-game averages.
-        # So let's count games.
-        counts = df.groupby('player_id').size().reset_index(name='games')
-        sums = sums.merge(counts, on='player_id')
-        
-        for col in ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M']:
-            sums[col] = sums[col] / sums['games']
-            
-        return sums
-        
-    return df
+    if precomputed:
+        # Explicit columns + dtypes: no per-object inference, int64 blocks throughout
+        df = pd.DataFrame.from_records(stats_data, columns=['player_id', 'games', *SUM_COLUMNS])
+        df = df.fillna(0).astype('int64')
+        sums = df[df['games'] > 0].rename(columns=lambda c: c[4:] if c.startswith('sum_') else c)
+        return _per_game_averages(sums)
+    
+    # Rows that already carry percent categories are taken as-is
+    if 'FG_PCT' in stats_data[0]:
+        return pd.DataFrame(stats_data)
+    
+    # Only the columns the aggregation needs, with compact integer dtypes
+    df = pd.DataFrame.from_records(stats_data, columns=['player_id', 'game_id', *RAW_STAT_COLUMNS])
+    df[RAW_STAT_COLUMNS] = df[RAW_STAT_COLUMNS].fillna(0)
+    df = df.astype({'player_id': 'int64', **dict.fromkeys(RAW_STAT_COLUMNS, 'int32')})
+    
+    # Sum totals and count games in a single groupby pass
+    agg = dict.fromkeys(RAW_STAT_COLUMNS, 'sum')
+    agg['game_id'] = 'size'
+    sums = (
+        df.groupby('player_id', sort=False, as_index=False)
+        .agg(agg)
+        .rename(columns={'game_id': 'games'})
+    )
+    return _per_game_averages(sums)
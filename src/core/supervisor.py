@@ -1,7 +1,9 @@
-from typing import Dict, Any, Type
+from typing import Dict, Any, Optional, Type
+from sqlalchemy import update
 from sqlmodel import Session, select
-from datetime import datetime, timezone
+import threading
 import traceback
+import uuid
 import logging
 
 from src.core.models import AgentTask, AuditLog, League
@@ -68,16 +70,20 @@ class ImportAgent(BaseAgent):
 
 class IngestionAgent(BaseAgent):
     """Agent for NBA-only data ingestion."""
+    def __init__(self):
+        # One client per agent so its HTTP connection pool and fetch caches
+        # are reused across ingestion tasks
+        self.client = NBAClient()
+    
     def run(self, session: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
         days = payload.get("days", 15)
         mock = payload.get("mock", False)
         limit_players = payload.get("limit_players")
         
         with acquire_lock(session, "global_ingest"):
-            client = NBAClient()
             # Pass the global engine (late bound)
-            player_result = client.sync_players(src.core.db.engine, mock=mock)
-            stats_result = client.sync_recent_stats(
+            player_result = self.client.sync_players(src.core.db.engine, mock=mock)
+            stats_result = self.client.sync_recent_stats(
                 src.core.db.engine, 
                 days=days, 
                 limit_players=limit_players,
@@ -201,13 +207,20 @@ class Supervisor:
         - hybrid_sync: Combined ESPN + NBA data sync
         - espn_roster_sync: ESPN roster sync only (quick update)
     """
-    _agents: Dict[str, Type[BaseAgent]] = {
+    _agent_classes: Dict[str, Type[BaseAgent]] = {
         "calculate_roto": RotoAgent,
         "import_roster": ImportAgent,
         "ingest_data": IngestionAgent,
         "hybrid_sync": HybridSyncAgent,
         "espn_roster_sync": ESPNRosterSyncAgent,
     }
+    # Agents are stateless apart from long-lived clients, so one instance
+    # per task type serves every task; each is created by its first task
+    _agent_instances: Dict[str, BaseAgent] = {}
+    _agent_instances_lock = threading.Lock()
+    
+    # Task types that report a committed "running" status while they execute
+    _long_running = frozenset({"ingest_data", "hybrid_sync", "espn_roster_sync"})
 
     @classmethod
     def submit_task(cls, task_type: str, payload: Dict[str, Any]) -> AgentTask:
@@ -223,43 +236,58 @@ class Supervisor:
             return task
 
     @classmethod
-    def run_task(cls, task_id: str):
+    def _get_agent(cls, task_type: str) -> Optional[BaseAgent]:
+        """Shared agent for a task type, or None if the type is unknown."""
+        agent = cls._agent_instances.get(task_type)
+        if agent is None and task_type in cls._agent_classes:
+            with cls._agent_instances_lock:
+                agent = cls._agent_instances.get(task_type)
+                if agent is None:
+                    agent = cls._agent_instances[task_type] = cls._agent_classes[task_type]()
+        return agent
+
+    @classmethod
+    def run_task(cls, task_id: uuid.UUID):
         """
         Executes a task. Should be called by a worker or BackgroundTask.
         """
         with Session(src.core.db.engine) as session:
-            task = session.get(AgentTask, task_id)
-            if not task:
+            row = session.exec(
+                select(AgentTask.task_type, AgentTask.payload).where(AgentTask.id == task_id)
+            ).first()
+            if not row:
                 logger.error(f"Task {task_id} not found")
                 return
+            task_type, payload = row
 
-            if task_type := cls._agents.get(task.task_type):
-                agent = task_type()
+            if agent := cls._get_agent(task_type):
+                # Only long-running tasks need a visible "running" state for pollers;
+                # short ones go straight from pending to their final status
+                if task_type in cls._long_running:
+                    session.exec(
+                        update(AgentTask).where(AgentTask.id == task_id).values(status="running")
+                    )
+                    session.commit()
                 
                 try:
-                    task.status = "running"
-                    session.add(task)
-                    session.commit()
-                    
                     # Execute Agent Logic
-                    result = agent.run(session, task.payload)
-                    
-                    task.result = result
-                    task.status = "completed"
+                    result = agent.run(session, payload)
+                    final = {"status": "completed", "result": result}
                 except BlockingIOError:
-                    task.status = "failed"
-                    task.error = "Resource locked. Try again later."
+                    session.rollback()
+                    final = {"status": "failed", "error": "Resource locked. Try again later."}
                 except Exception as e:
                     logger.error(f"Task failed: {e}")
-                    task.status = "failed"
-                    task.error = str(e)
-                    task.result = {"traceback": traceback.format_exc()}
-                finally:
-                    task.updated_at = datetime.now(timezone.utc)
-                    session.add(task)
-                    session.commit()
+                    session.rollback()
+                    final = {
+                        "status": "failed",
+                        "error": str(e),
+                        "result": {"traceback": traceback.format_exc()},
+                    }
             else:
-                task.status = "failed"
-                task.error = f"Unknown task type: {task.task_type}"
-                session.add(task)
-                session.commit()
+                final = {"status": "failed", "error": f"Unknown task type: {task_type}"}
+            
+            # One UPDATE for the final state, committed with the agent's own
+            # writes (audit logs etc.); updated_at is refreshed by the database
+            session.exec(update(AgentTask).where(AgentTask.id == task_id).values(**final))
+            session.commit()
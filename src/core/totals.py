@@ -0,0 +1,179 @@
+"""
+Incremental per-player season totals.
+
+PlayerStats rows are append-only, so instead of re-summing every game on
+each aggregation we fold newly ingested rows into PlayerSeasonTotals and
+let readers divide sums by games.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from src.core.models import STAT_COLUMNS, PlayerSeasonTotals, PlayerStats
+
+logger = logging.getLogger(__name__)
+
+# PlayerStats column -> PlayerSeasonTotals column
+TOTAL_COLUMNS = {col: f'sum_{col}' for col in STAT_COLUMNS}
+
+
+# Season that ingest folds games into by default and that readers report
+DEFAULT_SEASON = '2024-25'
+
+
+def dialect_insert(session: Session):
+    """Return the dialect-specific insert() that supports ON CONFLICT (PostgreSQL and SQLite only)."""
+    dialect = session.bind.dialect.name
+    if dialect == 'postgresql':
+        return pg_insert
+    if dialect == 'sqlite':
+        return sqlite_insert
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
+
+
+def upsert_season_totals(
+    session: Session,
+    stats_rows: Iterable[Dict[str, Any]],
+    season: str,
+) -> int:
+    """
+    Fold newly inserted PlayerStats rows into the season totals.
+
+    Rows are pre-summed per player so each player is touched once per call
+    (Postgres rejects an upsert that hits the same key twice). The caller
+    owns the transaction and should commit together with the stats rows.
+
+    Returns:
+        Number of players whose totals were updated
+    """
+    per_player: Dict[int, Dict[str, int]] = {}
+    for row in stats_rows:
+        acc = per_player.get(row['player_id'])
+        if acc is None:
+            acc = per_player[row['player_id']] = dict.fromkeys(TOTAL_COLUMNS.values(), 0)
+            acc['games'] = 0
+        acc['games'] += 1
+        for raw_col, total_col in TOTAL_COLUMNS.items():
+            acc[total_col] += row.get(raw_col) or 0
+
+    if not per_player:
+        return 0
+
+    values = [
+        {'player_id': player_id, 'season': season, **acc}
+        for player_id, acc in per_player.items()
+    ]
+    table = PlayerSeasonTotals.__table__
+    stmt = dialect_insert(session)(table).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['player_id', 'season'],
+        set_={
+            col: table.c[col] + stmt.excluded[col]
+            for col in ['games', *TOTAL_COLUMNS.values()]
+        },
+    )
+    session.exec(stmt)
+    return len(values)
+
+
+def player_totals_query(
+    player_ids: Optional[List[int]] = None,
+    start_date: Optional[date] = None,
+):
+    """SELECT player_id, games, sum_* FROM playerstats GROUP BY player_id (optionally filtered)."""
+    stmt = select(
+        PlayerStats.player_id,
+        func.count().label('games'),
+        *[func.sum(getattr(PlayerStats, raw)).label(total) for raw, total in TOTAL_COLUMNS.items()],
+    )
+    if player_ids is not None:
+        stmt = stmt.where(PlayerStats.player_id.in_(player_ids))
+    if start_date is not None:
+        stmt = stmt.where(PlayerStats.game_date >= start_date)
+    return stmt.group_by(PlayerStats.player_id)
+
+
+def fetch_player_totals(
+    session: Session,
+    player_ids: Optional[List[int]] = None,
+    start_date: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Per-player game counts and stat sums computed by the database.
+
+    Rows have the PlayerSeasonTotals shape (player_id, games, sum_*), so they
+    feed straight into aggregate_player_stats(..., precomputed=True) without
+    shipping every game row to pandas.
+    """
+    return [row._asdict() for row in session.exec(player_totals_query(player_ids, start_date)).all()]
+
+
+def fetch_season_totals(
+    session: Session,
+    season: str = DEFAULT_SEASON,
+    player_ids: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Per-player game counts and stat sums read from PlayerSeasonTotals.
+    
+    Same row shape as fetch_player_totals, without scanning PlayerStats.
+    This is the single source for the /stats, trade and lineup endpoints.
+    """
+    stmt = select(
+        PlayerSeasonTotals.player_id,
+        PlayerSeasonTotals.games,
+        *[getattr(PlayerSeasonTotals, total) for total in TOTAL_COLUMNS.values()],
+    ).where(PlayerSeasonTotals.season == season)
+    if player_ids is not None:
+        stmt = stmt.where(PlayerSeasonTotals.player_id.in_(player_ids))
+    return [row._asdict() for row in session.exec(stmt).all()]
+
+
+def backfill_season_totals(session: Session, season: str = DEFAULT_SEASON) -> int:
+    """
+    Rebuild the season's totals if the table is empty but games are stored.
+    
+    Databases that predate PlayerSeasonTotals start with an empty table;
+    without this the first ingest would leave totals covering only its own
+    games. Returns the number of players rebuilt (0 if nothing to do).
+    """
+    has_totals = session.exec(select(PlayerSeasonTotals.player_id).limit(1)).first() is not None
+    has_stats = session.exec(select(PlayerStats.id).limit(1)).first() is not None
+    if has_totals or not has_stats:
+        return 0
+    logger.warning(
+        f"PlayerSeasonTotals is empty; backfilling from PlayerStats and attributing "
+        f"every stored game to {season}. Run rebuild_season_totals per season if "
+        f"the stored games span several seasons."
+    )
+    return rebuild_season_totals(session, season)
+
+
+def rebuild_season_totals(session: Session, season: str) -> int:
+    """
+    Recompute a season's totals from PlayerStats with one GROUP BY.
+
+    Use this to backfill rows ingested before totals were maintained.
+    PlayerStats carries no season column, so every stored game is
+    attributed to the given season.
+
+    Returns:
+        Number of players with totals
+    """
+    rows = fetch_player_totals(session)
+
+    session.exec(delete(PlayerSeasonTotals).where(PlayerSeasonTotals.season == season))
+    if rows:
+        session.exec(
+            PlayerSeasonTotals.__table__.insert(),
+            params=[{'season': season, **row} for row in rows],
+        )
+    session.commit()
+    logger.info(f"Rebuilt season totals for {len(rows)} players ({season})")
+    return len(rows)
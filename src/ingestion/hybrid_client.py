@@ -9,12 +9,18 @@ This provides the best of both worlds for fantasy basketball analysis.
 """
 
 import logging
-from typing import Optional, Dict, List, Any, Callable
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional, Dict, List, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from rapidfuzz import fuzz, process
+from sqlalchemy import delete, func, update
 from sqlmodel import Session, select
 
-from src.core.models import Player, PlayerStats, League, FantasyTeam
+from src.core.bulk import bulk_insert_team_rosters
+from src.core.models import Player, PlayerStats, League, FantasyTeam, TeamRoster
 from src.ingestion.nba_client import NBAClient, SyncResult
 from src.ingestion.espn_client import ESPNFantasyClient, ESPNPlayer, ESPNSyncResult
 
@@ -66,8 +72,8 @@ class HybridSyncResult:
                 "players_unmapped": self.players_unmapped,
             },
             "total_duration_seconds": round(self.total_duration, 2),
-            "errors": self.errors,
-            "warnings": self.warnings,
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
         }
 
 
@@ -92,6 +98,12 @@ class HybridDataClient:
         result = client.full_sync(db_engine, local_league_id=1)
     """
     
+    # Minimum RapidFuzz WRatio score for a name match
+    NAME_MATCH_CUTOFF = 85
+    
+    # How long a fetched ESPN player pool is reused before re-fetching (seconds)
+    ESPN_PLAYERS_TTL = 300
+    
     def __init__(
         self,
         espn_league_id: Optional[int] = None,
@@ -125,7 +137,12 @@ class HybridDataClient:
         
         # Cache for ID mapping
         self._espn_to_nba_map: Dict[int, int] = {}
-        self._name_to_player: Dict[str, Player] = {}
+        self._name_to_player_id: Dict[str, int] = {}
+        self._name_keys: List[str] = []
+        self._name_index_count: Optional[int] = None
+        
+        # (fetched_at, players) from the last ESPN player pool fetch
+        self._espn_players_cache: Optional[Tuple[float, List[ESPNPlayer]]] = None
     
     @classmethod
     def from_league(cls, league: League) -> "HybridDataClient":
@@ -144,32 +161,68 @@ class HybridDataClient:
             espn_swid=league.espn_swid,
         )
     
-    def _build_name_index(self, session: Session) -> Dict[str, Player]:
-        """Build an index of player names for fuzzy matching."""
-        if self._name_to_player:
-            return self._name_to_player
-        
-        players = session.exec(select(Player)).all()
-        self._name_to_player = {p.full_name.lower(): p for p in players}
-        return self._name_to_player
+    def _build_name_index(self, session: Session) -> Dict[str, int]:
+        """Build an index of normalized player names -> player ID for matching."""
+        # Rebuild only when players were added or removed since the last build
+        player_count = session.exec(select(func.count(Player.id))).one()
+        if self._name_to_player_id and player_count == self._name_index_count:
+            return self._name_to_player_id
+        
+        # Only id + name are needed; skip hydrating full Player objects
+        rows = session.exec(select(Player.id, Player.full_name)).all()
+        self._name_to_player_id = {
+            self._normalize_name(full_name): player_id for player_id, full_name in rows
+        }
+        # Keep the choices list around so fuzzy lookups don't rebuild it
+        self._name_keys = list(self._name_to_player_id)
+        self._name_index_count = player_count
+        return self._name_to_player_id
+    
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normalize a player name to the name index key form."""
+        return name.strip().lower()
     
-    def _find_player_by_name(self, name: str, session: Session) -> Optional[Player]:
-        """Find a player by name with fuzzy matching fallback."""
-        import difflib
+    def _match_players_by_name(
+        self, queries: List[str], name_index: Dict[str, int]
+    ) -> List[Optional[int]]:
+        """
+        Fuzzy-match many normalized names against the player index in one batch.
         
-        name_index = self._build_name_index(session)
-        name_lower = name.strip().lower()
+        RapidFuzz's cdist scores every query against every indexed name in a
+        single (multi-threaded) C++ call. Queries must already be normalized
+        with _normalize_name, and name_index must come from _build_name_index.
+        """
+        if not queries or not self._name_keys:
+            return [None] * len(queries)
         
-        # Exact match
-        if name_lower in name_index:
-            return name_index[name_lower]
+        scores = process.cdist(
+            queries, self._name_keys,
+            scorer=fuzz.WRatio, score_cutoff=self.NAME_MATCH_CUTOFF, workers=-1,
+        )
+        best = scores.argmax(axis=1)
         
-        # Fuzzy match
-        matches = difflib.get_close_matches(name_lower, name_index.keys(), n=1, cutoff=0.85)
-        if matches:
-            return name_index[matches[0]]
+        return [
+            name_index[self._name_keys[j]] if scores[i, j] >= self.NAME_MATCH_CUTOFF else None
+            for i, j in enumerate(best)
+        ]
+    
+    def _get_espn_players(self) -> List[ESPNPlayer]:
+        """Fetch the ESPN player pool, reusing a recent response."""
+        if self._espn_players_cache:
+            fetched_at, players = self._espn_players_cache
+            if time.monotonic() - fetched_at < self.ESPN_PLAYERS_TTL:
+                return players
         
-        return None
+        players = self.espn_client.fetch_player_stats()
+        if players:  # don't pin a failed (empty) fetch for the whole TTL
+            self._espn_players_cache = (time.monotonic(), players)
+        return players
+    
+    def _prefetch_espn_data(self) -> List[Dict[str, Any]]:
+        """Fetch ESPN teams and warm the player pool cache (no DB access)."""
+        self._get_espn_players()
+        return self.espn_client.fetch_teams()
     
     def build_espn_id_mapping(
         self, 
@@ -183,25 +236,43 @@ class HybridDataClient:
         """
         mapping = {}
         
+        # Resolve ESPN IDs we already know with one query
+        espn_ids = [ep.espn_id for ep in espn_players]
+        existing_by_espn = {
+            p.espn_id: p
+            for p in session.exec(select(Player).where(Player.espn_id.in_(espn_ids))).all()
+        }
+        
+        unmapped = []
         for ep in espn_players:
-            # First check if we already have this ESPN ID in the database
-            stmt = select(Player).where(Player.espn_id == ep.espn_id)
-            existing = session.exec(stmt).first()
-            
+            existing = existing_by_espn.get(ep.espn_id)
             if existing:
                 mapping[ep.espn_id] = existing.id
-                continue
-            
-            # Otherwise, try to match by name
-            player = self._find_player_by_name(ep.name, session)
-            if player:
-                # Update the player with their ESPN ID
-                player.espn_id = ep.espn_id
-                session.add(player)
-                mapping[ep.espn_id] = player.id
+            else:
+                unmapped.append(ep)
+        
+        # Otherwise, try to match by name: exact index hits first, and only
+        # the true misses go through fuzzy matching
+        name_index = self._build_name_index(session)
+        normalized = [self._normalize_name(ep.name) for ep in unmapped]
+        matches = [name_index.get(name) for name in normalized]
+        misses = [i for i, player_id in enumerate(matches) if player_id is None]
+        if misses:
+            fuzzy = self._match_players_by_name([normalized[i] for i in misses], name_index)
+            for i, player_id in zip(misses, fuzzy):
+                matches[i] = player_id
+        
+        espn_id_updates = []
+        for ep, player_id in zip(unmapped, matches):
+            if player_id is not None:
+                espn_id_updates.append({"id": player_id, "espn_id": ep.espn_id})
+                mapping[ep.espn_id] = player_id
             else:
                 logger.warning(f"Could not map ESPN player: {ep.name} (ESPN ID: {ep.espn_id})")
         
+        # Store the new ESPN IDs with one executemany UPDATE keyed on Player.id
+        if espn_id_updates:
+            session.exec(update(Player), params=espn_id_updates)
         session.commit()
         self._espn_to_nba_map = mapping
         logger.info(f"Built ESPN->DB ID mapping for {len(mapping)} players")
@@ -249,12 +320,18 @@ class HybridDataClient:
         self,
         session: Session,
         local_league_id: int,
+        espn_teams: Optional[List[Dict[str, Any]]] = None,
     ) -> ESPNSyncResult:
         """
         Sync rosters from ESPN to local database.
         
         This updates which players are on which fantasy teams,
         directly from your ESPN league.
+        
+        Args:
+            session: Database session
+            local_league_id: Local league to sync rosters into
+            espn_teams: Teams already fetched from ESPN (fetched here if None)
         """
         result = ESPNSyncResult(success=False)
         
@@ -269,31 +346,50 @@ class HybridDataClient:
                 result.errors.append(f"Local league {local_league_id} not found")
                 return result
             
-            # Fetch ESPN teams with rosters
-            espn_teams = self.espn_client.fetch_teams()
+            if espn_teams is None:
+                # Fetch ESPN teams with rosters and all ESPN players (for ID
+                # mapping) concurrently - both are independent HTTP round trips
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    teams_future = executor.submit(self.espn_client.fetch_teams)
+                    players_future = executor.submit(self._get_espn_players)
+                    espn_teams = teams_future.result()
+                    espn_players = players_future.result()
+            else:
+                espn_players = self._get_espn_players()
+            
             if not espn_teams:
                 result.errors.append("No teams returned from ESPN")
                 return result
             
-            # Get all ESPN players for ID mapping
-            espn_players = self.espn_client.fetch_player_stats()
             id_mapping = self.build_espn_id_mapping(session, espn_players)
             
+            # Load the league's teams once and resolve by ESPN team ID, then name
+            local_teams = session.exec(
+                select(FantasyTeam).where(FantasyTeam.league_id == local_league_id)
+            ).all()
+            teams_by_espn_id = {t.espn_team_id: t for t in local_teams if t.espn_team_id}
+            teams_by_name = {t.name: t for t in local_teams}
+            
+            # Load every rostered player in one query
+            roster_player_ids = {
+                id_mapping[p.get("espn_id")]
+                for t in espn_teams
+                for p in t.get("roster", [])
+                if p.get("espn_id") in id_mapping
+            }
+            existing_player_ids = set(
+                session.exec(select(Player.id).where(Player.id.in_(roster_player_ids))).all()
+            )
+            
+            # local team ID -> player IDs for its rebuilt roster
+            rosters: Dict[int, Dict[int, None]] = {}
+            
             for espn_team in espn_teams:
                 # Find or create local team
-                stmt = select(FantasyTeam).where(
-                    FantasyTeam.espn_team_id == espn_team["id"],
-                    FantasyTeam.league_id == local_league_id
+                local_team = (
+                    teams_by_espn_id.get(espn_team["id"])
+                    or teams_by_name.get(espn_team["name"])
                 )
-                local_team = session.exec(stmt).first()
-                
-                if not local_team:
-                    # Try matching by name
-                    stmt = select(FantasyTeam).where(
-                        FantasyTeam.name == espn_team["name"],
-                        FantasyTeam.league_id == local_league_id
-                    )
-                    local_team = session.exec(stmt).first()
                 
                 if not local_team:
                     # Create new team
@@ -305,6 +401,8 @@ class HybridDataClient:
                     )
                     session.add(local_team)
                     session.flush()
+                    teams_by_espn_id[local_team.espn_team_id] = local_team
+                    teams_by_name[local_team.name] = local_team
                     result.teams_synced += 1
                 else:
                     # Update ESPN team ID if not set
@@ -312,22 +410,35 @@ class HybridDataClient:
                         local_team.espn_team_id = espn_team["id"]
                     result.teams_synced += 1
                 
-                # Clear and rebuild roster
-                local_team.players.clear()
-                
+                # Resolve the roster (deduplicated, in ESPN order)
+                team_player_ids: Dict[int, None] = {}
+                unmapped: List[Tuple[Optional[str], Optional[int]]] = []
                 for espn_player in espn_team.get("roster", []):
                     espn_id = espn_player.get("espn_id")
+                    player_id = id_mapping.get(espn_id)
                     
-                    if espn_id in id_mapping:
-                        player_id = id_mapping[espn_id]
-                        player = session.get(Player, player_id)
-                        if player:
-                            local_team.players.append(player)
-                            result.players_synced += 1
-                    else:
-                        result.errors.append(
-                            f"Unmapped player: {espn_player.get('name')} (ESPN ID: {espn_id})"
-                        )
+                    if player_id is None:
+                        unmapped.append((espn_player.get("name"), espn_id))
+                    elif player_id in existing_player_ids:
+                        team_player_ids[player_id] = None
+                
+                if unmapped:
+                    result.errors.extend(
+                        f"Unmapped player: {name} (ESPN ID: {espn_id})"
+                        for name, espn_id in unmapped
+                    )
+                
+                rosters[local_team.id] = team_player_ids
+                result.players_synced += len(team_player_ids)
+            
+            # Clear and rebuild every synced roster with one DELETE and one bulk
+            # write on the link table instead of per-player ORM collection events
+            session.exec(delete(TeamRoster).where(TeamRoster.team_id.in_(list(rosters))))
+            bulk_insert_team_rosters(session, [
+                {"team_id": team_id, "player_id": player_id}
+                for team_id, player_ids in rosters.items()
+                for player_id in player_ids
+            ])
             
             # Update league sync timestamp
             league.last_espn_sync = datetime.now(timezone.utc)
@@ -356,13 +467,19 @@ class HybridDataClient:
             return 0
         
         try:
-            espn_players = self.espn_client.fetch_player_stats()
+            espn_players = self._get_espn_players()
             updated = 0
             
+            # Load all players with a known ESPN ID in one query
+            players_by_espn_id = {
+                p.espn_id: p
+                for p in session.exec(
+                    select(Player).where(Player.espn_id.in_([ep.espn_id for ep in espn_players]))
+                ).all()
+            }
+            
             for ep in espn_players:
-                # Find player by ESPN ID
-                stmt = select(Player).where(Player.espn_id == ep.espn_id)
-                player = session.exec(stmt).first()
+                player = players_by_espn_id.get(ep.espn_id)
                 
                 if player:
                     # Update ESPN metadata
@@ -389,6 +506,7 @@ class HybridDataClient:
         limit_nba_players: Optional[int] = None,
         mock_nba: bool = False,
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        session: Optional[Session] = None,
     ) -> HybridSyncResult:
         """
         Perform a full hybrid sync of all data sources.
@@ -402,14 +520,24 @@ class HybridDataClient:
             limit_nba_players: Limit NBA player stats sync (for testing)
             mock_nba: Use mock NBA data
             progress_callback: Callback(phase, current, total) for progress updates
+            session: Session to use for the ESPN phase; one is opened (and
+                closed) on db_engine if not provided
             
         Returns:
             HybridSyncResult with details of the sync operation
         """
-        import time
-        
         result = HybridSyncResult()
-        start_time = time.time()
+        start_time = time.monotonic()
+        
+        # Start each full sync from a fresh ESPN player pool
+        self._espn_players_cache = None
+        
+        run_espn = bool(sync_espn_rosters and self.espn_client and local_league_id)
+        
+        # The ESPN HTTP fetches don't depend on NBA data, so overlap them with
+        # the NBA phases; only the ESPN DB writes wait for NBA players.
+        executor = ThreadPoolExecutor(max_workers=1)
+        espn_prefetch = executor.submit(self._prefetch_espn_data) if run_espn else None
         
         try:
             # Phase 1: Sync NBA Players (foundation)
@@ -417,10 +545,10 @@ class HybridDataClient:
                 if progress_callback:
                     progress_callback("nba_players", 0, 1)
                 
-                nba_start = time.time()
+                nba_start = time.monotonic()
                 player_result = self.sync_nba_players(db_engine, mock=mock_nba)
                 result.nba_players_synced = player_result.records_created
-                result.nba_sync_duration = time.time() - nba_start
+                result.nba_sync_duration = time.monotonic() - nba_start
                 
                 if not player_result.success:
                     result.errors.extend(player_result.errors)
@@ -433,14 +561,14 @@ class HybridDataClient:
                 if progress_callback:
                     progress_callback("nba_stats", 0, 1)
                 
-                nba_start = time.time()
+                nba_start = time.monotonic()
                 stats_result = self.sync_nba_stats(
                     db_engine, 
                     limit_players=limit_nba_players,
                     mock=mock_nba
                 )
                 result.nba_stats_synced = stats_result.records_created
-                result.nba_sync_duration += time.time() - nba_start
+                result.nba_sync_duration += time.monotonic() - nba_start
                 
                 if not stats_result.success:
                     result.errors.extend(stats_result.errors)
@@ -449,17 +577,28 @@ class HybridDataClient:
                     progress_callback("nba_stats", 1, 1)
             
             # Phase 3: Sync ESPN Rosters
-            if sync_espn_rosters and self.espn_client and local_league_id:
+            if run_espn:
                 if progress_callback:
                     progress_callback("espn_rosters", 0, 1)
                 
-                espn_start = time.time()
-                with Session(db_engine) as session:
-                    espn_result = self.sync_espn_rosters(session, local_league_id)
+                espn_start = time.monotonic()
+                try:
+                    espn_teams = espn_prefetch.result()
+                except Exception as e:
+                    # Let sync_espn_rosters retry the fetch and report the error
+                    logger.warning(f"ESPN prefetch failed: {e}")
+                    espn_teams = None
+                
+                # Reuse the caller's session (and its identity map) when given
+                session_cm = nullcontext(session) if session is not None else Session(db_engine)
+                with session_cm as espn_session:
+                    espn_result = self.sync_espn_rosters(
+                        espn_session, local_league_id, espn_teams=espn_teams or None
+                    )
                     
                     result.espn_teams_synced = espn_result.teams_synced
                     result.espn_players_synced = espn_result.players_synced
-                    result.espn_sync_duration = time.time() - espn_start
+                    result.espn_sync_duration = time.monotonic() - espn_start
                     
                     if not espn_result.success:
                         result.errors.extend(espn_result.errors)
@@ -472,7 +611,7 @@ class HybridDataClient:
             elif sync_espn_rosters and not self.espn_client:
                 result.warnings.append("ESPN sync requested but ESPN client not configured")
             
-            result.total_duration = time.time() - start_time
+            result.total_duration = time.monotonic() - start_time
             result.success = len(result.errors) == 0
             
             logger.info(
@@ -483,8 +622,10 @@ class HybridDataClient:
             
         except Exception as e:
             result.errors.append(f"Hybrid sync failed: {str(e)}")
-            result.total_duration = time.time() - start_time
+            result.total_duration = time.monotonic() - start_time
             logger.error(f"Hybrid sync failed: {e}", exc_info=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return result
     
@@ -507,19 +648,30 @@ class HybridDataClient:
         if not player:
             return None
         
-        # Get NBA stats
-        stmt = select(PlayerStats).where(
+        # Averages over the last 10 games, computed by the database
+        recent = select(PlayerStats).where(
             PlayerStats.player_id == player_id
-        ).order_by(PlayerStats.game_date.desc()).limit(10)
-        recent_stats = session.exec(stmt).all()
-        
-        # Calculate averages
-        if recent_stats:
-            avg_pts = sum(s.pts for s in recent_stats) / len(recent_stats)
-            avg_reb = sum(s.reb for s in recent_stats) / len(recent_stats)
-            avg_ast = sum(s.ast for s in recent_stats) / len(recent_stats)
-        else:
-            avg_pts = avg_reb = avg_ast = 0
+        ).order_by(PlayerStats.game_date.desc()).limit(10).subquery()
+        avg_pts, avg_reb, avg_ast, games = session.exec(
+            select(
+                func.avg(recent.c.pts),
+                func.avg(recent.c.reb),
+                func.avg(recent.c.ast),
+                func.count(),
+            ).select_from(recent)
+        ).one()
+        
+        # Last 5 games, projecting only the columns we serialize
+        stmt = select(
+            PlayerStats.game_date,
+            PlayerStats.matchup,
+            PlayerStats.pts,
+            PlayerStats.reb,
+            PlayerStats.ast,
+        ).where(
+            PlayerStats.player_id == player_id
+        ).order_by(PlayerStats.game_date.desc()).limit(5)
+        last_games = session.exec(stmt).all()
         
         return {
             "id": player.id,
@@ -532,19 +684,19 @@ class HybridDataClient:
             "espn_ownership_pct": player.espn_ownership_pct,
             "espn_injury_status": player.espn_injury_status,
             "recent_averages": {
-                "pts": round(avg_pts, 1),
-                "reb": round(avg_reb, 1),
-                "ast": round(avg_ast, 1),
-                "games": len(recent_stats),
+                "pts": round(avg_pts or 0, 1),
+                "reb": round(avg_reb or 0, 1),
+                "ast": round(avg_ast or 0, 1),
+                "games": games,
             },
             "last_games": [
                 {
-                    "date": str(s.game_date),
-                    "matchup": s.matchup,
-                    "pts": s.pts,
-                    "reb": s.reb,
-                    "ast": s.ast,
+                    "date": str(game_date),
+                    "matchup": matchup,
+                    "pts": pts,
+                    "reb": reb,
+                    "ast": ast,
                 }
-                for s in recent_stats[:5]
+                for game_date, matchup, pts, reb, ast in last_games
             ],
         }
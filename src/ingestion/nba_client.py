@@ -1,19 +1,143 @@
 from nba_api.stats.static import players
-from nba_api.stats.endpoints import playergamelog
+from nba_api.stats.library.http import NBAStatsHTTP
 from sqlmodel import Session, select
-from src.core.models import Player, PlayerStats
+from src.core.models import Player
+from src.core.bulk import bulk_insert_playerstats
+from src.core.totals import dialect_insert
 from src.core.db import engine
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any, Callable
+from typing import Optional, Dict, List, Any, Callable, Deque, Iterable, Iterator
 from dataclasses import dataclass
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 import time
+import numpy as np
 import pandas as pd
 import random
 import logging
-from requests.exceptions import ReadTimeout, ConnectionError
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ReadTimeout, ConnectionError, HTTPError
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Game log columns that must be present for a row to be stored
+REQUIRED_STAT_FIELDS = ['Game_ID', 'GAME_DATE', 'MATCHUP']
+
+# Accepted GAME_DATE formats, most common (stats.nba.com) first
+GAME_DATE_FORMATS = ["%b %d, %Y", "%Y-%m-%d", "%m/%d/%Y"]
+
+# Game log stat column -> PlayerStats column
+STAT_COLUMN_MAP = {
+    'PTS': 'pts', 'REB': 'reb', 'AST': 'ast', 'STL': 'stl', 'BLK': 'blk',
+    'FGM': 'fgm', 'FGA': 'fga', 'FTM': 'ftm', 'FTA': 'fta', 'FG3M': 'tpm', 'TOV': 'tov',
+}
+
+PLAYER_GAMELOG_URL = 'https://stats.nba.com/stats/playergamelog'
+
+
+def _build_http_session() -> requests.Session:
+    """Keep-alive session with a connection pool for stats.nba.com."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # Timeouts/connection errors are retried by NBAClient itself; the
+        # adapter only retries transient gateway errors
+        max_retries=Retry(
+            total=None, connect=0, read=0, status=2,
+            backoff_factor=0.5, status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+        ),
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+# One pooled session shared by every NBAClient, built on first use so that
+# importing this module has no side effects
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the shared HTTP session, creating it on the first call.
+    
+    nba_api keeps its HTTP session at class level, so installing it there
+    makes all endpoint calls reuse warm TCP/TLS connections instead of
+    reconnecting.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = _build_http_session()
+                NBAStatsHTTP.set_session(session)
+                _http_session = session
+    return _http_session
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+    
+    Allows bursts of up to `capacity` requests, refilling at `rate` tokens
+    per second. A caller that finds the bucket empty reserves the next token
+    (the count goes negative) and sleeps outside the lock until it is due,
+    so concurrent callers queue fairly.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 
 @dataclass
 class SyncResult:
@@ -22,11 +146,21 @@ class SyncResult:
     records_created: int = 0
     records_updated: int = 0
     records_skipped: int = 0
-    errors: List[str] = None
+    errors: Deque[str] = None
+    errors_dropped: int = 0
+    
+    # Keep only the most recent errors so a bad ingest can't grow the result
+    # (and the AuditLog row it is serialized into) without bound
+    MAX_ERRORS = 1000
     
     def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+        self.errors = deque(self.errors or (), maxlen=self.MAX_ERRORS)
+    
+    def add_error(self, message: str):
+        """Record an error, counting the oldest one as dropped once full."""
+        if len(self.errors) >= self.MAX_ERRORS:
+            self.errors_dropped += 1
+        self.errors.append(message)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -34,7 +168,8 @@ class SyncResult:
             "records_created": self.records_created,
             "records_updated": self.records_updated,
             "records_skipped": self.records_skipped,
-            "errors": self.errors,
+            "errors": list(self.errors),
+            "errors_dropped": self.errors_dropped,
         }
 
 
@@ -42,24 +177,64 @@ class NBAClient:
     """Client for fetching NBA data and syncing to database."""
     
     # Rate limiting configuration
-    MIN_REQUEST_INTERVAL = 0.6  # Minimum seconds between API requests
+    MIN_REQUEST_INTERVAL = 0.6  # Average seconds between API requests (sustained rate)
+    BURST_CAPACITY = 10  # Requests allowed back-to-back after an idle period
     MAX_RETRIES = 3
-    BATCH_SIZE = 100  # Number of records to batch before committing
+    FETCH_WORKERS = 16  # Concurrent game log fetches; the token bucket still paces requests
+    # Decorrelated-jitter backoff bounds (seconds) between retries
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+    # Response caching (seconds): the active-player list changes at most
+    # daily; a game log only changes when a new game is played
+    PLAYERS_CACHE_TTL = 86400
+    GAMELOG_CACHE_TTL = 3600
+    GAMELOG_CACHE_SIZE = 4096
+    # Rows to accumulate before each bulk insert + commit, by dialect.
+    # PostgreSQL stops gaining around 1k rows per batch; SQLite/MySQL keep
+    # improving well past that.
+    DIALECT_BATCH_SIZES = {'postgresql': 1000, 'sqlite': 5000}
+    DEFAULT_BATCH_SIZE = 1000
     
-    def __init__(self):
+    def __init__(self, batch_size: Optional[int] = None):
+        """
+        Args:
+            batch_size: Rows per bulk insert/commit; auto-tuned per dialect if None
+        """
+        self.batch_size = batch_size
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Referer': 'https://www.nba.com/',
             'Origin': 'https://www.nba.com/'
         }
-        self._last_request_time = 0
+        self._players_cache = TTLCache(maxsize=1, ttl=self.PLAYERS_CACHE_TTL)
+        self._gamelog_cache = TTLCache(maxsize=self.GAMELOG_CACHE_SIZE, ttl=self.GAMELOG_CACHE_TTL)
+        self._bucket = TokenBucket(rate=1 / self.MIN_REQUEST_INTERVAL, capacity=self.BURST_CAPACITY)
 
-    def _rate_limit(self):
-        """Enforce rate limiting between API requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.MIN_REQUEST_INTERVAL:
-            time.sleep(self.MIN_REQUEST_INTERVAL - elapsed)
-        self._last_request_time = time.time()
+    @property
+    def session(self) -> requests.Session:
+        """Shared pooled HTTP session (created on the first request)."""
+        return get_http_session()
+
+    def _batch_size(self, db_engine) -> int:
+        """Batch size for this engine: the explicit setting, else the dialect default."""
+        if self.batch_size:
+            return self.batch_size
+        return self.DIALECT_BATCH_SIZES.get(db_engine.dialect.name, self.DEFAULT_BATCH_SIZE)
+
+    def _next_backoff(self, prev_delay: float) -> float:
+        """Decorrelated jitter: random in [base, 3 * previous], capped."""
+        return min(self.RETRY_MAX_DELAY, random.uniform(self.RETRY_BASE_DELAY, prev_delay * 3))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds from a Retry-After header (delta-seconds form), if present."""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None  # HTTP-date form; fall back to jittered backoff
 
     def fetch_active_players(self, mock: bool = False) -> List[Dict[str, Any]]:
         """Fetches all active players and returns them as a list of dicts."""
@@ -67,12 +242,17 @@ class NBAClient:
             logger.info("Using mock player data")
             return self._generate_mock_players()
         
-        self._rate_limit()
+        cached = self._players_cache.get('active')
+        if cached is not None:
+            return cached
+        
+        self._bucket.acquire()
         try:
             nba_players = players.get_active_players()
             if not nba_players:
                 raise ValueError("NBA API returned empty player list")
             logger.info(f"Fetched {len(nba_players)} active players from NBA API")
+            self._players_cache.set('active', nba_players)
             return nba_players
         except Exception as e:
             logger.warning(f"Error fetching players from NBA API: {e}. Using mock data.")
@@ -98,27 +278,55 @@ class NBAClient:
         if mock:
             return self._generate_mock_stats(player_id)
         
+        cached = self._gamelog_cache.get((player_id, season))
+        if cached is not None:
+            return cached
+        
         last_error = None
+        delay = self.RETRY_BASE_DELAY
         for attempt in range(self.MAX_RETRIES):
-            self._rate_limit()
+            self._bucket.acquire()
             try:
-                gamelog = playergamelog.PlayerGameLog(
-                    player_id=player_id, 
-                    season=season, 
+                response = self.session.get(
+                    PLAYER_GAMELOG_URL,
+                    params={
+                        'PlayerID': player_id,
+                        'Season': season,
+                        'SeasonType': 'Regular Season',
+                        'LeagueID': '00',
+                    },
                     headers=self.headers,
-                    timeout=10  # Increased timeout
+                    timeout=10,
                 )
-                df = gamelog.get_data_frames()[0]
+                response.raise_for_status()
+                df = self._parse_gamelog(response.json())
                 if not df.empty:
                     logger.debug(f"Fetched {len(df)} games for player {player_id}")
+                    # Only real, non-empty logs are cached so failures get retried
+                    self._gamelog_cache.set((player_id, season), df)
                     return df
                 return pd.DataFrame()  # Return empty DataFrame if no data
+            except HTTPError as e:
+                last_error = e
+                response = e.response
+                if response is None or response.status_code != 429:
+                    logger.error(f"HTTP error fetching stats for player {player_id}: {e}")
+                    break
+                # Throttled: wait exactly as long as the server asks, if it says
+                wait_time = self._retry_after(response)
+                if wait_time is None:
+                    delay = wait_time = self._next_backoff(delay)
+                logger.warning(
+                    f"Rate limited fetching player {player_id} "
+                    f"(attempt {attempt+1}/{self.MAX_RETRIES}). Waiting {wait_time:.1f}s..."
+                )
+                time.sleep(wait_time)
             except (ReadTimeout, ConnectionError) as e:
                 last_error = e
-                wait_time = (attempt + 1) * 2  # Exponential backoff
+                delay = wait_time = self._next_backoff(delay)
                 logger.warning(
                     f"Attempt {attempt+1}/{self.MAX_RETRIES} failed for player {player_id}: {e}. "
-                    f"Waiting {wait_time}s..."
+                    f"Waiting {wait_time:.1f}s..."
                 )
                 time.sleep(wait_time)
             except Exception as e:
@@ -139,28 +347,74 @@ class NBAClient:
             {'id': 203507, 'full_name': 'Giannis Antetokounmpo', 'is_active': True},
         ]
 
-    def _generate_mock_stats(self, player_id: int):
-        """Generates random stats for a player."""
-        dates = [datetime.now() - timedelta(days=x) for x in range(10)]
-        data = []
-        for d in dates:
-            data.append({
-                'Game_ID': f"0022400{random.randint(100,999)}",
-                'GAME_DATE': d.strftime("%b %d, %Y"),
-                'MATCHUP': 'GSW vs LAL',
-                'PTS': random.randint(15, 35),
-                'REB': random.randint(2, 12),
-                'AST': random.randint(2, 12),
-                'STL': random.randint(0, 3),
-                'BLK': random.randint(0, 2),
-                'FGM': random.randint(5, 12),
-                'FGA': random.randint(10, 25),
-                'FTM': random.randint(2, 8),
-                'FTA': random.randint(2, 10),
-                'FG3M': random.randint(0, 6),
-                'TOV': random.randint(1, 5)
-            })
-        return pd.DataFrame(data)
+    @staticmethod
+    def _parse_gamelog(payload: Dict[str, Any]) -> pd.DataFrame:
+        """Build a game log frame holding only the columns ingest uses from the raw JSON."""
+        result_set = payload['resultSets'][0]
+        positions = {header: i for i, header in enumerate(result_set['headers'])}
+        rows = result_set['rowSet']
+        return pd.DataFrame({
+            col: [row[positions[col]] for row in rows]
+            for col in (*REQUIRED_STAT_FIELDS, *STAT_COLUMN_MAP)
+            if col in positions
+        })
+
+    def _generate_mock_stats(self, player_id: int, n_games: int = 10):
+        """Generates random stats for a player, built column-wise."""
+        rng = np.random.default_rng()
+        dates = pd.date_range(end=pd.Timestamp.now(), periods=n_games)[::-1]
+        
+        def randint(low: int, high: int) -> np.ndarray:
+            return rng.integers(low, high, size=n_games, endpoint=True)
+        
+        return pd.DataFrame({
+            'Game_ID': np.char.add("0022400", randint(100, 999).astype(str)),
+            'GAME_DATE': dates.strftime("%b %d, %Y"),
+            'MATCHUP': 'GSW vs LAL',
+            'PTS': randint(15, 35),
+            'REB': randint(2, 12),
+            'AST': randint(2, 12),
+            'STL': randint(0, 3),
+            'BLK': randint(0, 2),
+            'FGM': randint(5, 12),
+            'FGA': randint(10, 25),
+            'FTM': randint(2, 8),
+            'FTA': randint(2, 10),
+            'FG3M': randint(0, 6),
+            'TOV': randint(1, 5),
+        })
+
+    def _iter_player_rows(
+        self, active_players: Iterable[Dict[str, Any]], result: SyncResult
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield Player insert rows lazily, recording invalid entries on result."""
+        for p in active_players:
+            # Validate required fields
+            if not p.get('id') or not p.get('full_name'):
+                result.add_error(f"Invalid player data: {p}")
+                result.records_skipped += 1
+                continue
+            
+            yield {
+                'nba_id': p['id'],
+                'full_name': p['full_name'],
+                'is_active': p.get('is_active', True),
+            }
+
+    def _insert_new_players(self, session: Session, chunk: List[Dict[str, Any]]) -> int:
+        """
+        Insert players whose nba_id is not stored yet; returns how many were inserted.
+        
+        Existing players are skipped by the database (ON CONFLICT on nba_id)
+        rather than by preloading every stored ID.
+        """
+        table = Player.__table__
+        stmt = (
+            dialect_insert(session)(table)
+            .on_conflict_do_nothing(index_elements=['nba_id'])
+            .returning(table.c.nba_id)
+        )
+        return len(session.exec(stmt, params=chunk).all())
 
     def sync_players(
         self, 
@@ -180,8 +434,9 @@ class NBAClient:
             SyncResult with operation details
         """
         result = SyncResult(success=False)
+        batch_size = self._batch_size(db_engine)
         
-        with Session(db_engine) as session:
+        with Session(db_engine, autoflush=False, expire_on_commit=False) as session:
             try:
                 active_players = self.fetch_active_players(mock=mock)
                 total = len(active_players)
@@ -191,46 +446,19 @@ class NBAClient:
                     result.success = True
                     return result
                 
-                # Pre-fetch existing NBA IDs for efficient lookup (avoid N+1)
-                existing_ids = set(
-                    session.exec(select(Player.nba_id)).all()
-                )
-                logger.info(f"Found {len(existing_ids)} existing players in database")
-                
-                new_players = []
-                for idx, p in enumerate(active_players):
-                    # Validate required fields
-                    if not p.get('id') or not p.get('full_name'):
-                        result.errors.append(f"Invalid player data: {p}")
-                        result.records_skipped += 1
-                        continue
-                    
-                    if p['id'] in existing_ids:
-                        result.records_skipped += 1
-                        continue
-                    
-                    new_player = Player(
-                        nba_id=p['id'],
-                        full_name=p['full_name'],
-                        is_active=p.get('is_active', True)
-                    )
-                    new_players.append(new_player)
-                    result.records_created += 1
-                    
-                    # Batch commit for performance
-                    if len(new_players) >= self.BATCH_SIZE:
-                        session.add_all(new_players)
-                        session.commit()
-                        logger.debug(f"Committed batch of {len(new_players)} players")
-                        new_players = []
+                rows = self._iter_player_rows(active_players, result)
+                processed = 0
+                while chunk := list(islice(rows, batch_size)):
+                    # Batch commit for performance (Core executemany, no ORM objects)
+                    inserted = self._insert_new_players(session, chunk)
+                    session.commit()
+                    logger.debug(f"Committed batch of {inserted} players")
                     
+                    result.records_created += inserted
+                    result.records_skipped += len(chunk) - inserted
+                    processed += len(chunk)
                     if progress_callback:
-                        progress_callback(idx + 1, total)
-                
-                # Commit remaining players
-                if new_players:
-                    session.add_all(new_players)
-                    session.commit()
+                        progress_callback(processed, total)
                 
                 result.success = True
                 logger.info(
@@ -240,37 +468,85 @@ class NBAClient:
                 
             except Exception as e:
                 session.rollback()
-                result.errors.append(str(e))
+                result.add_error(str(e))
                 logger.error(f"Player sync failed: {e}")
                 
         return result
 
-    def _parse_game_date(self, date_str: str) -> Optional[datetime]:
-        """Parse game date from various formats."""
-        formats = ["%b %d, %Y", "%Y-%m-%d", "%m/%d/%Y"]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        return None
-
-    def _validate_stat_row(self, row: pd.Series) -> List[str]:
-        """Validate a stats row and return list of errors."""
-        errors = []
-        required_fields = ['Game_ID', 'GAME_DATE', 'MATCHUP']
-        for field in required_fields:
-            if field not in row or pd.isna(row[field]):
-                errors.append(f"Missing required field: {field}")
+    def _parse_game_dates(self, date_strs: pd.Series) -> pd.Series:
+        """
+        Parse a column of game dates (NBA, ISO or US format) in one pass per format.
+        
+        Returns datetime.date values, with NaT where no format matched.
+        """
+        parsed = pd.to_datetime(date_strs, format=GAME_DATE_FORMATS[0], errors='coerce')
+        for fmt in GAME_DATE_FORMATS[1:]:
+            if not parsed.isna().any():
+                break
+            parsed = parsed.fillna(pd.to_datetime(date_strs, format=fmt, errors='coerce'))
+        return parsed.dt.date.where(parsed.notna(), pd.NaT)
+
+    def _build_stat_records(
+        self,
+        df: pd.DataFrame,
+        player_id: int,
+        result: SyncResult,
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate and coerce a game log DataFrame into PlayerStats row dicts.
+        
+        Validation and type coercion run column-wise over the whole frame;
+        only rejected rows are visited individually (to build error messages).
+        Games already in the database are not filtered here - the insert
+        skips them (ON CONFLICT DO NOTHING).
+        """
+        df = df.reindex(columns=[*REQUIRED_STAT_FIELDS, *STAT_COLUMN_MAP])
+        
+        numeric = df[list(STAT_COLUMN_MAP)]
+        missing = df[REQUIRED_STAT_FIELDS].isna()
+        negative = numeric.lt(0)
+        invalid = missing.any(axis=1) | negative.any(axis=1)
+        for idx in df.index[invalid]:
+            errors = [f"Missing required field: {f}" for f in REQUIRED_STAT_FIELDS if missing.at[idx, f]]
+            errors += [f"Negative value for {f}: {numeric.at[idx, f]}" for f in STAT_COLUMN_MAP if negative.at[idx, f]]
+            result.add_error(f"Player {player_id}, Game {df.at[idx, 'Game_ID']}: {errors}")
+        
+        game_dates = self._parse_game_dates(df['GAME_DATE'].where(~invalid))
+        bad_date = ~invalid & game_dates.isna()
+        for idx in df.index[bad_date]:
+            result.add_error(
+                f"Invalid date format: {df.at[idx, 'GAME_DATE']} for game {df.at[idx, 'Game_ID']}"
+            )
         
-        # Validate numeric fields are non-negative
-        numeric_fields = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FGM', 'FGA', 'FTM', 'FTA', 'FG3M', 'TOV']
-        for field in numeric_fields:
-            if field in row and not pd.isna(row[field]):
-                if row[field] < 0:
-                    errors.append(f"Negative value for {field}: {row[field]}")
+        # Keep the first row for a game that appears twice in one log
+        keep = ~(invalid | bad_date)
+        keep &= ~(df['Game_ID'].where(keep).duplicated() & keep)
+        result.records_skipped += int((~keep).sum())
+        if not keep.any():
+            return []
         
-        return errors
+        df = df[keep]
+        records = numeric[keep].fillna(0).astype('int64').rename(columns=STAT_COLUMN_MAP)
+        records.insert(0, 'matchup', df['MATCHUP'])
+        records.insert(0, 'game_id', df['Game_ID'])
+        records.insert(0, 'game_date', game_dates[keep])
+        records.insert(0, 'player_id', player_id)
+        
+        return records.to_dict('records')
+
+    def _insert_stats_batch(
+        self,
+        session: Session,
+        stats_batch: List[Dict[str, Any]],
+        season: str,
+        batch_size: int,
+        result: SyncResult,
+    ) -> None:
+        """Bulk insert a batch; games already stored count as skipped."""
+        inserted = bulk_insert_playerstats(session, stats_batch, season, chunk_size=batch_size)
+        result.records_created += inserted
+        result.records_skipped += len(stats_batch) - inserted
+        logger.debug(f"Committed batch of {inserted} stats records")
 
     def sync_recent_stats(
         self, 
@@ -278,7 +554,8 @@ class NBAClient:
         days: int = 15, 
         limit_players: Optional[int] = None, 
         mock: bool = False,
-        progress_callback: Optional[Callable[[int, int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        season: str = '2024-25',
     ) -> SyncResult:
         """
         Syncs stats for players with batch processing and validation.
@@ -289,114 +566,69 @@ class NBAClient:
             limit_players: Maximum number of players to sync (for testing)
             mock: If True, use mock data
             progress_callback: Optional callback(current, total, player_name) for progress
+            season: Season to fetch; new games are also folded into its PlayerSeasonTotals
             
         Returns:
             SyncResult with operation details
         """
         result = SyncResult(success=False)
+        batch_size = self._batch_size(db_engine)
         
-        with Session(db_engine) as session:
+        with Session(db_engine, autoflush=False, expire_on_commit=False) as session:
             try:
-                statement = select(Player).where(Player.is_active == True)
-                players_db = session.exec(statement).all()
-                
+                # Plain (id, nba_id, full_name) tuples: nothing to reload after batch commits
+                statement = select(Player.id, Player.nba_id, Player.full_name).where(Player.is_active == True)
                 if limit_players:
-                    players_db = players_db[:limit_players]
+                    statement = statement.limit(limit_players)
+                players_db = session.exec(statement).all()
                 
                 total_players = len(players_db)
                 logger.info(f"Syncing stats for {total_players} players...")
                 
-                # Pre-fetch existing game IDs per player for efficient dedup
-                existing_games_stmt = select(
-                    PlayerStats.player_id, 
-                    PlayerStats.game_id
-                )
-                existing_games = session.exec(existing_games_stmt).all()
-                existing_game_set = set((pg.player_id, pg.game_id) for pg in existing_games)
-                logger.info(f"Found {len(existing_game_set)} existing game records")
-                
                 stats_batch = []
                 
-                for idx, player in enumerate(players_db):
-                    if progress_callback:
-                        progress_callback(idx + 1, total_players, player.full_name)
-                    
-                    df = self.fetch_player_stats(player.nba_id, mock=mock)
-                    
-                    if df is None or df.empty:
-                        logger.debug(f"No stats found for {player.full_name}")
-                        continue
-                    
-                    for _, row in df.iterrows():
-                        game_id = row.get('Game_ID')
+                # Fetch game logs on worker threads; this thread is the only
+                # writer, so the session is never shared across threads
+                executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+                try:
+                    futures = {
+                        executor.submit(self.fetch_player_stats, nba_id, season=season, mock=mock): (player_id, full_name)
+                        for player_id, nba_id, full_name in players_db
+                    }
+                    for idx, future in enumerate(as_completed(futures)):
+                        player_id, full_name = futures[future]
+                        if progress_callback:
+                            progress_callback(idx + 1, total_players, full_name)
                         
-                        # Check for duplicate
-                        if (player.id, game_id) in existing_game_set:
-                            result.records_skipped += 1
-                            continue
+                        df = future.result()
                         
-                        # Validate row
-                        validation_errors = self._validate_stat_row(row)
-                        if validation_errors:
-                            result.errors.append(
-                                f"Player {player.id}, Game {game_id}: {validation_errors}"
-                            )
-                            result.records_skipped += 1
+                        if df is None or df.empty:
+                            logger.debug(f"No stats found for {full_name}")
                             continue
                         
-                        # Parse date
-                        game_date = self._parse_game_date(row['GAME_DATE'])
-                        if not game_date:
-                            result.errors.append(
-                                f"Invalid date format: {row['GAME_DATE']} for game {game_id}"
-                            )
-                            result.records_skipped += 1
-                            continue
-                        
-                        # Create stats record with safe defaults for missing numeric fields
-                        stats = PlayerStats(
-                            player_id=player.id,
-                            game_date=game_date,
-                            game_id=game_id,
-                            matchup=row['MATCHUP'],
-                            pts=int(row.get('PTS', 0) or 0),
-                            reb=int(row.get('REB', 0) or 0),
-                            ast=int(row.get('AST', 0) or 0),
-                            stl=int(row.get('STL', 0) or 0),
-                            blk=int(row.get('BLK', 0) or 0),
-                            fgm=int(row.get('FGM', 0) or 0),
-                            fga=int(row.get('FGA', 0) or 0),
-                            ftm=int(row.get('FTM', 0) or 0),
-                            fta=int(row.get('FTA', 0) or 0),
-                            tpm=int(row.get('FG3M', 0) or 0),
-                            tov=int(row.get('TOV', 0) or 0)
-                        )
-                        stats_batch.append(stats)
-                        existing_game_set.add((player.id, game_id))  # Prevent in-batch dupes
-                        result.records_created += 1
+                        stats_batch.extend(self._build_stat_records(df, player_id, result))
                         
                         # Batch commit for performance
-                        if len(stats_batch) >= self.BATCH_SIZE:
-                            session.add_all(stats_batch)
-                            session.commit()
-                            logger.debug(f"Committed batch of {len(stats_batch)} stats records")
+                        if len(stats_batch) >= batch_size:
+                            self._insert_stats_batch(session, stats_batch, season, batch_size, result)
                             stats_batch = []
+                finally:
+                    # Don't keep fetching for a sync that already failed
+                    executor.shutdown(wait=False, cancel_futures=True)
                 
                 # Commit remaining records
                 if stats_batch:
-                    session.add_all(stats_batch)
-                    session.commit()
-                    logger.debug(f"Committed final batch of {len(stats_batch)} stats records")
+                    self._insert_stats_batch(session, stats_batch, season, batch_size, result)
                 
                 result.success = True
                 logger.info(
                     f"Stats sync complete: {result.records_created} created, "
-                    f"{result.records_skipped} skipped, {len(result.errors)} errors"
+                    f"{result.records_skipped} skipped, {len(result.errors) + result.errors_dropped} errors"
                 )
                 
             except Exception as e:
                 session.rollback()
-                result.errors.append(str(e))
+                result.add_error(str(e))
                 logger.error(f"Stats sync failed: {e}", exc_info=True)
         
         return result
@@ -10,22 +10,33 @@ st.set_page_config(page_title="Fantasy NBA Assistant", layout="wide")
 
 st.title("🏀 Fantasy NBA Assistant (8-Cat)")
 
-def poll_task(task_id):
-    """Polls the task endpoint until completion."""
+@st.cache_resource
+def get_http():
+    """One keep-alive session to the API, reused across reruns and task polls."""
+    return requests.Session()
+
+http = get_http()
+
+def poll_task(task_id, timeout=20.0):
+    """Polls the task endpoint until completion, checking quickly at first then backing off."""
     progress = st.progress(0)
     status_text = st.empty()
+    url = f"{API_URL}/tasks/{task_id}"
     
-    for i in range(20): # Max 20 attempts
-        time.sleep(1)
-        r = requests.get(f"{API_URL}/tasks/{task_id}")
+    delay = 0.05
+    start = time.monotonic()
+    while (elapsed := time.monotonic() - start) < timeout:
+        r = http.get(url)
         if r.status_code == 200:
             task = r.json()
             status_text.text(f"Status: {task['status']}")
-            progress.progress((i+1) * 5)
+            progress.progress(min(int(elapsed / timeout * 100), 99))
             
-            if task['status'] in ['completed', 'failed']:
+            if task['status'] in ('completed', 'failed'):
                 progress.progress(100)
                 return task
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
     
     status_text.text("Timeout waiting for task.")
     return None
@@ -34,7 +45,7 @@ def poll_task(task_id):
 st.sidebar.header("Controls")
 if st.sidebar.button("Run Data Ingestion"):
     try:
-        response = requests.post(f"{API_URL}/ingest", json={"days": 15})
+        response = http.post(f"{API_URL}/ingest", json={"days": 15})
         if response.status_code == 200:
             task_data = response.json()
             st.sidebar.success(f"Ingestion Submitted (Task: {task_data['task_id']})")
@@ -51,7 +62,7 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["Dashboard", "Trade Analyzer", "Player E
 @st.cache_data(ttl=60)
 def get_players():
     try:
-        r = requests.get(f"{API_URL}/players")
+        r = http.get(f"{API_URL}/players")
         if r.status_code == 200:
             return r.json()
     except:
@@ -61,7 +72,7 @@ def get_players():
 @st.cache_data(ttl=60)
 def get_stats():
     try:
-        r = requests.get(f"{API_URL}/stats")
+        r = http.get(f"{API_URL}/stats")
         if r.status_code == 200:
             return pd.DataFrame(r.json())
     except:
@@ -70,7 +81,7 @@ def get_stats():
 
 def get_teams():
     try:
-        r = requests.get(f"{API_URL}/teams")
+        r = http.get(f"{API_URL}/teams")
         if r.status_code == 200:
             return r.json()
     except:
@@ -79,7 +90,7 @@ def get_teams():
 
 def get_leagues():
     try:
-        r = requests.get(f"{API_URL}/leagues")
+        r = http.get(f"{API_URL}/leagues")
         if r.status_code == 200:
             return r.json()
     except:
@@ -88,7 +99,7 @@ def get_leagues():
 
 def get_team_players(team_id):
     try:
-        r = requests.get(f"{API_URL}/teams/{team_id}/players")
+        r = http.get(f"{API_URL}/teams/{team_id}/players")
         if r.status_code == 200:
             return r.json()
     except:
@@ -129,7 +140,7 @@ with tab1:
             st.warning("Please select players or a team.")
         else:
             try:
-                response = requests.post(f"{API_URL}/recommend/lineup", json=roster_ids)
+                response = http.post(f"{API_URL}/recommend/lineup", json=roster_ids)
                 if response.status_code == 200:
                     df = pd.DataFrame(response.json())
                     if not df.empty:
@@ -201,7 +212,7 @@ with tab2:
             }
             
             try:
-                r = requests.post(f"{API_URL}/analyze/trade", json=payload)
+                r = http.post(f"{API_URL}/analyze/trade", json=payload)
                 if r.status_code == 200:
                     data = r.json()
                     
@@ -253,7 +264,7 @@ with tab4:
                 payload["league_id"] = league_opts[sel_league]
                 
             try:
-                r = requests.post(f"{API_URL}/teams", json=payload)
+                r = http.post(f"{API_URL}/teams", json=payload)
                 if r.status_code == 200:
                     st.success(f"Team '{new_team_name}' created!")
                     st.rerun()
@@ -288,7 +299,7 @@ with tab4:
                 if add_p_name:
                     p_id = player_map[add_p_name]
                     try:
-                        r = requests.post(f"{API_URL}/teams/{team_id}/add_player", json={"player_id": p_id})
+                        r = http.post(f"{API_URL}/teams/{team_id}/add_player", json={"player_id": p_id})
                         if r.status_code == 200:
                             st.success(f"Added {add_p_name}")
                             st.rerun()
@@ -315,7 +326,7 @@ with tab5:
                     roster_map = json.loads(import_data)
                     lid = l_opts[sel_l_import]
                     with st.spinner("Submitting Import Task..."):
-                        r = requests.post(f"{API_URL}/leagues/{lid}/import_rosters", json={"roster_map": roster_map})
+                        r = http.post(f"{API_URL}/leagues/{lid}/import_rosters", json={"roster_map": roster_map})
                         if r.status_code == 200:
                             task_info = r.json()
                             st.success(f"Import Task Submitted (ID: {task_info['task_id']})")
@@ -346,7 +357,7 @@ with tab5:
     if st.button("Create League"):
         if l_name:
              try:
-                r = requests.post(f"{API_URL}/leagues", json={"name": l_name})
+                r = http.post(f"{API_URL}/leagues", json={"name": l_name})
                 if r.status_code == 200:
                     st.success(f"League '{l_name}' created!")
                     st.rerun()
@@ -370,7 +381,7 @@ with tab5:
                     # To be better, we could add a "Recalculate" POST endpoint and a "Get" GET endpoint.
                     # Current API impl: triggers task, returns rows.
                     # Let's just show rows and say "Calculation started in background".
-                    r = requests.get(f"{API_URL}/leagues/{lid}/standings")
+                    r = http.get(f"{API_URL}/leagues/{lid}/standings")
                     if r.status_code == 200:
                         st.info("Calculation triggered in background. Showing latest available data.")
                         standings = r.json()
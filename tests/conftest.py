@@ -0,0 +1,188 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from src.api.app import app, get_session
+from src.core.bulk import bulk_insert_playerstats
+from src.core.models import FantasyTeam, League, Player, TeamRoster
+from src.core.totals import dialect_insert
+from datetime import date
+import pytest
+import src.core.db  # Import to override engine
+
+# Test Engine, created in pytest_sessionstart so importing this module
+# (e.g. --collect-only) has no side effects
+test_engine = None
+
+
+def create_test_engine():
+    """
+    In-memory SQLite engine. StaticPool hands every thread the same
+    connection, so background tasks see the same database. Each
+    pytest-xdist worker is its own process and so gets its own database.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    
+    # The test DB is disposable: skip journaling fsyncs and keep temp data in RAM
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        cursor.close()
+    
+    return engine
+
+
+def get_test_session():
+    with Session(test_engine) as session:
+        yield session
+
+
+# Tables holding the seeded players and stats; kept between tests so one seed serves the run
+INGESTED_TABLES = {"player", "playerstats", "playerseasontotals"}
+
+# Same players as the mock ingest (roster import matches against these names)
+SEED_PLAYERS = [
+    (201939, "Stephen Curry"),
+    (2544, "LeBron James"),
+    (203999, "Nikola Jokic"),
+    (1629029, "Luka Doncic"),
+    (203507, "Giannis Antetokounmpo"),
+]
+SEED_GAMES_PER_PLAYER = 3
+SEED_SEASON = "2024-25"
+
+
+def _create_league_scenario(name: str, rosters: dict) -> int:
+    """
+    Create a league with teams and rosters in one transaction, for test setup
+    that isn't exercising the /leagues, /teams and /add_player endpoints.
+    
+    rosters maps team name -> player ids. Returns the league id.
+    """
+    with Session(test_engine) as session:
+        league = League(name=name)
+        session.add(league)
+        session.flush()
+        league_id = league.id
+        
+        teams = [FantasyTeam(name=team_name, league_id=league_id) for team_name in rosters]
+        session.add_all(teams)
+        session.flush()
+        
+        rows = [
+            {"team_id": team.id, "player_id": player_id}
+            for team, player_ids in zip(teams, rosters.values())
+            for player_id in player_ids
+        ]
+        if rows:
+            session.exec(TeamRoster.__table__.insert(), params=rows)
+        session.commit()
+    return league_id
+
+
+def _is_xdist_controller(config) -> bool:
+    """True in the pytest-xdist process that only distributes tests to workers."""
+    return bool(getattr(config.option, "numprocesses", None)) and not hasattr(config, "workerinput")
+
+
+def pytest_sessionstart(session):
+    global test_engine
+    if _is_xdist_controller(session.config) or session.config.option.collectonly:
+        return
+    test_engine = create_test_engine()
+    
+    # Override the global engine in src.core.db so that create_db_and_tables uses it
+    # This is critical because app.on_startup imports and uses src.core.db.engine
+    session._original_engine = src.core.db.engine
+    src.core.db.engine = test_engine
+    app.dependency_overrides[get_session] = get_test_session
+    
+    # Create tables and start the app (lifespan) once per test run
+    SQLModel.metadata.create_all(test_engine)
+    session._client_cm = TestClient(app)
+    session._client = session._client_cm.__enter__()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not hasattr(session, "_client_cm"):
+        return
+    session._client_cm.__exit__(None, None, None)
+    SQLModel.metadata.drop_all(test_engine)
+    
+    app.dependency_overrides.pop(get_session, None)
+    src.core.db.engine = session._original_engine
+
+
+@pytest.fixture(scope="session")
+def client(request):
+    return request.session._client
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """Delete test-created rows after every test, children before parents, keeping the schema."""
+    yield
+    with test_engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            if table.name not in INGESTED_TABLES:
+                conn.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def seeded_players(client):
+    """
+    Insert the mock players and a few deterministic games each, straight
+    through the database (only test_ingest_endpoint exercises /ingest).
+    
+    Returns the players as {id, nba_id, full_name} dicts, in SEED_PLAYERS order.
+    """
+    with Session(test_engine) as session:
+        stmt = dialect_insert(session)(Player.__table__).on_conflict_do_nothing(index_elements=["nba_id"])
+        session.exec(stmt, params=[
+            {"nba_id": nba_id, "full_name": name, "is_active": True} for nba_id, name in SEED_PLAYERS
+        ])
+        ids = dict(session.exec(
+            select(Player.nba_id, Player.id).where(Player.nba_id.in_([nba_id for nba_id, _ in SEED_PLAYERS]))
+        ).all())
+        
+        stats = [
+            {
+                "player_id": ids[nba_id], "game_id": f"SEED{i}{g:02d}",
+                "game_date": date(2024, 11, 1 + g), "matchup": "GSW vs LAL",
+                "pts": 15 + 3 * i + g, "reb": 4 + i, "ast": 3 + i, "stl": 1, "blk": i % 3,
+                "fgm": 6 + i, "fga": 13 + i, "ftm": 3, "fta": 4, "tpm": 1 + i % 4, "tov": 2,
+            }
+            for i, (nba_id, _) in enumerate(SEED_PLAYERS)
+            for g in range(SEED_GAMES_PER_PLAYER)
+        ]
+        bulk_insert_playerstats(session, stats, SEED_SEASON)
+        session.commit()
+    
+    return [{"id": ids[nba_id], "nba_id": nba_id, "full_name": name} for nba_id, name in SEED_PLAYERS]
+
+
+@pytest.fixture(scope="session")
+def players_by_id(seeded_players):
+    """The seeded players keyed by id."""
+    return {p["id"]: p for p in seeded_players}
+
+
+@pytest.fixture
+def db_session():
+    """A session on the test database, for setup the API doesn't expose."""
+    with Session(test_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def create_league_scenario():
+    """Factory fixture: create_league_scenario(name, rosters) -> league id."""
+    return _create_league_scenario
@@ -0,0 +1,33 @@
+"""Polling helpers shared by the API tests."""
+
+import time
+
+
+TERMINAL_STATUSES = frozenset(("completed", "failed"))
+
+
+def wait_for_task(client, task_id: str, timeout: float = 10.0) -> dict:
+    """Wait for a background task to complete, polling fast at first then backing off."""
+    url = f"/tasks/{task_id}"
+    interval = 0.005
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = client.get(url)
+        if response.status_code == 200:
+            task = response.json()
+            if task["status"] in TERMINAL_STATUSES:
+                return task
+        time.sleep(interval)
+        interval = min(interval * 1.5, 0.1)
+    raise TimeoutError(f"Task {task_id} did not complete within {timeout}s")
+
+
+def poll_until(fn, timeout: float = 5.0, interval: float = 0.05):
+    """Call fn until it returns a truthy value, or raise after timeout."""
+    start = time.time()
+    while time.time() - start < timeout:
+        value = fn()
+        if value:
+            return value
+        time.sleep(interval)
+    raise TimeoutError(f"Condition not met within {timeout}s")
@@ -0,0 +1,80 @@
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from src.core import importer
+from src.core.importer import RosterImporter
+from src.core.models import Player
+import pytest
+
+NAMES = ["Stephen Curry", "Seth Curry", "LeBron James", "Nikola Jokic", "Jalen Williams", "Jaylin Williams"]
+
+
+@pytest.fixture
+def roster_importer():
+    """An importer over a private in-memory player table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Player(nba_id=i, full_name=name) for i, name in enumerate(NAMES, 1)])
+        session.commit()
+        yield RosterImporter(session)
+    engine.dispose()
+
+
+def test_find_player_exact_and_fuzzy(roster_importer):
+    assert roster_importer.find_player("  lebron JAMES ").full_name == "LeBron James"
+    assert roster_importer.find_player("Stephen Cury").full_name == "Stephen Curry"
+    assert roster_importer.find_player("Jalen Wiliams").full_name == "Jalen Williams"
+    assert roster_importer.find_player("Victor Wembanyama") is None
+    assert roster_importer.find_player("   ") is None
+
+
+def test_trigram_shortlist_limits_fuzzy_scoring(roster_importer, monkeypatch):
+    """Only the FUZZY_CANDIDATES names sharing the most trigrams are scored."""
+    scored = []
+    ratio = importer.fuzz.ratio
+    
+    def counting_ratio(a, b, **kwargs):
+        scored.append(b)
+        return ratio(a, b, **kwargs)
+    
+    monkeypatch.setattr(importer.fuzz, "ratio", counting_ratio)
+    monkeypatch.setattr(RosterImporter, "FUZZY_CANDIDATES", 2)
+    
+    assert roster_importer.find_player("Stephen Cury").full_name == "Stephen Curry"
+    assert len(scored) <= 2
+    assert "stephen curry" in scored
+    assert "nikola jokic" not in scored
+
+
+def test_fuzzy_scan_stops_on_near_exact_hit(roster_importer, monkeypatch):
+    scored = []
+    
+    def perfect_ratio(a, b, **kwargs):
+        scored.append(b)
+        return 100.0
+    
+    monkeypatch.setattr(importer.fuzz, "ratio", perfect_ratio)
+    
+    assert roster_importer.find_player("Jay Williams") is not None
+    assert len(scored) == 1
+
+
+def test_fuzzy_results_are_memoized(roster_importer, monkeypatch):
+    """A repeated misspelling is scored once, including a repeated miss."""
+    scored = []
+    ratio = importer.fuzz.ratio
+    
+    def counting_ratio(a, b, **kwargs):
+        scored.append(b)
+        return ratio(a, b, **kwargs)
+    
+    monkeypatch.setattr(importer.fuzz, "ratio", counting_ratio)
+    
+    match = roster_importer.find_player("Jalen Wiliams")
+    assert roster_importer.find_player("Victor Wembanyama") is None
+    calls = len(scored)
+    assert calls > 0
+    
+    assert roster_importer.find_player("jalen wiliams ") is match
+    assert roster_importer.find_player("Victor Wembanyama") is None
+    assert len(scored) == calls
@@ -1,64 +1,7 @@
-from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
-from src.api.app import app, get_session
-from src.core.supervisor import Supervisor
+from src.core.models import League, PlayerSeasonTotals
+from src.core.totals import DEFAULT_SEASON, rebuild_season_totals
+from tests.helpers import poll_until, wait_for_task
 import pytest
-import os
-import tempfile
-import time
-import src.core.db  # Import to override engine
-
-# Use a temporary file for the test DB to avoid permission issues
-# and ensure clean state
-test_db_fd, test_db_path = tempfile.mkstemp(suffix=".db")
-sqlite_url = f"sqlite:///{test_db_path}"
-
-# Create a Test Engine (SQLite)
-test_engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
-
-# Override the global engine in src.core.db so that create_db_and_tables uses it
-# This is critical because app.on_startup imports and uses src.core.db.engine
-src.core.db.engine = test_engine
-
-def get_test_session():
-    with Session(test_engine) as session:
-        yield session
-
-app.dependency_overrides[get_session] = get_test_session
-
-
-def wait_for_task(client, task_id: str, timeout: float = 10.0) -> dict:
-    """Wait for a background task to complete."""
-    start = time.time()
-    while time.time() - start < timeout:
-        response = client.get(f"/tasks/{task_id}")
-        if response.status_code == 200:
-            task = response.json()
-            if task["status"] in ("completed", "failed"):
-                return task
-        time.sleep(0.1)
-    raise TimeoutError(f"Task {task_id} did not complete within {timeout}s")
-
-
-@pytest.fixture(name="client")
-def client_fixture():
-    # Create tables in the test database
-    SQLModel.metadata.create_all(test_engine)
-    
-    with TestClient(app) as client:
-        yield client
-        
-    # Teardown
-    SQLModel.metadata.drop_all(test_engine)
-
-
-# Cleanup after all tests
-@pytest.fixture(scope="session", autouse=True)
-def cleanup_db():
-    yield
-    os.close(test_db_fd)
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
 
 
 def test_ingest_endpoint(client):
@@ -87,15 +30,23 @@ def test_ingest_endpoint(client):
     stats = response.json()
     assert len(stats) > 0
 
-def test_team_management(client):
-    """Test creating teams and adding players."""
-    # Ingest data first so we have players
-    ingest_res = client.post("/ingest", json={"days": 5, "mock": True})
-    task = wait_for_task(client, ingest_res.json()["task_id"])
-    assert task["status"] == "completed"
+def test_stats_top_n(client, seeded_players):
+    """top_n returns the N best players by z_total; non-positive values are rejected."""
+    all_stats = client.get("/stats").json()
+    assert len(all_stats) >= 3
+    
+    response = client.get("/stats", params={"top_n": 2})
+    assert response.status_code == 200
+    top = response.json()
+    assert [r["player_id"] for r in top] == [r["player_id"] for r in all_stats[:2]]
     
-    players = client.get("/players").json()
-    if not players:
+    for bad in (0, -1):
+        assert client.get("/stats", params={"top_n": bad}).status_code == 422
+
+
+def test_team_management(client, seeded_players):
+    """Test creating teams and adding players."""
+    if not seeded_players:
         pytest.skip("No players found")
     
     # Create Team
@@ -106,7 +57,7 @@ def test_team_management(client):
     team_id = team["id"]
     
     # Add Player
-    p_id = players[0]["id"]
+    p_id = seeded_players[0]["id"]
     response = client.post(f"/teams/{team_id}/add_player", json={"player_id": p_id})
     assert response.status_code == 200
     
@@ -117,66 +68,50 @@ def test_team_management(client):
     assert len(team_players) == 1
     assert team_players[0]["id"] == p_id
 
-def test_league_standings(client):
+def test_league_standings(client, seeded_players, create_league_scenario):
     """Test league standings calculation."""
-    # Ingest mock data
-    ingest_res = client.post("/ingest", json={"days": 5, "mock": True})
-    task = wait_for_task(client, ingest_res.json()["task_id"])
-    assert task["status"] == "completed"
-    
-    players = client.get("/players").json()
-    if len(players) < 2:
+    if len(seeded_players) < 2:
         pytest.skip("Not enough players for league test")
         
-    # Create League
-    l_res = client.post("/leagues", json={"name": "Test League"})
-    assert l_res.status_code == 200
-    league_id = l_res.json()["id"]
-    
-    # Create 2 Teams
-    t1 = client.post("/teams", json={"name": "Team A", "league_id": league_id}).json()
-    t2 = client.post("/teams", json={"name": "Team B", "league_id": league_id}).json()
-    
-    # Add different players
-    client.post(f"/teams/{t1['id']}/add_player", json={"player_id": players[0]['id']})
-    client.post(f"/teams/{t2['id']}/add_player", json={"player_id": players[1]['id']})
+    # League with two teams holding different players (the endpoints that
+    # build this are covered by the other tests)
+    league_id = create_league_scenario(
+        "Test League",
+        {"Team A": [seeded_players[0]['id']], "Team B": [seeded_players[1]['id']]},
+    )
     
     # Calculate Standings (this triggers a background task but returns current standings)
     s_res = client.get(f"/leagues/{league_id}/standings")
     assert s_res.status_code == 200
     
-    # Give background task time to complete, then re-fetch
-    time.sleep(0.5)
-    s_res = client.get(f"/leagues/{league_id}/standings")
-    standings = s_res.json()
-    
-    # Standings may be empty on first request before calculation completes
-    # After waiting, there should be standings
-    if standings:
-        assert standings[0]['total_roto_points'] > 0
+    # Standings may be empty on first request before calculation completes,
+    # so re-fetch until the background task has stored them
+    standings = poll_until(lambda: client.get(f"/leagues/{league_id}/standings").json())
+    assert standings[0]['total_roto_points'] > 0
 
-def test_roster_import(client):
+# Mock players are: Stephen Curry, LeBron James, Nikola Jokic, Luka Doncic, Giannis Antetokounmpo
+@pytest.mark.parametrize(
+    "roster_map,expected_rostered,expected_missing",
+    [
+        ({"Warriors": ["Steph Curry"]}, {"Stephen Curry"}, []),
+        ({"Lakers": ["Lebron James", "Unknown Player"]}, {"LeBron James"}, ["Unknown Player"]),
+        (
+            {"Warriors": ["Steph Curry"], "Lakers": ["Lebron James", "Unknown Player"]},
+            {"Stephen Curry", "LeBron James"},
+            ["Unknown Player"],
+        ),
+    ],
+    ids=["fuzzy-match", "unknown-player", "multi-team"],
+)
+def test_roster_import(client, seeded_players, roster_map, expected_rostered, expected_missing):
     """Test roster import with fuzzy player name matching."""
-    # Ingest mock data first
-    ingest_res = client.post("/ingest", json={"days": 5, "mock": True})
-    task = wait_for_task(client, ingest_res.json()["task_id"])
-    assert task["status"] == "completed"
-    
-    players = client.get("/players").json()
-    if not players:
+    if not seeded_players:
         pytest.skip("No players found")
         
     # Create League
     l_res = client.post("/leagues", json={"name": "Import League"})
     league_id = l_res.json()["id"]
     
-    # Prepare Map (Using fuzzy names)
-    # Mock players are: Stephen Curry, LeBron James, Nikola Jokic, Luka Doncic, Giannis Antetokounmpo
-    roster_map = {
-        "Warriors": ["Steph Curry"], 
-        "Lakers": ["Lebron James", "Unknown Player"]
-    }
-    
     res = client.post(f"/leagues/{league_id}/import_rosters", json={"roster_map": roster_map})
     assert res.status_code == 200
     
@@ -185,33 +120,27 @@ def test_roster_import(client):
     assert import_task["status"] == "completed"
     
     report = import_task["result"]
-    assert report["teams_created"] == 2
-    assert report["players_added"] == 2  # Steph and Lebron
-    assert len(report["players_not_found"]) == 1
-    assert report["players_not_found"][0]["player"] == "Unknown Player"
-    
-    # Verify Roster
-    teams = client.get("/teams").json()
-    warriors = next(t for t in teams if t["name"] == "Warriors")
-    assert warriors["league_id"] == league_id
-    
-    p_res = client.get(f"/teams/{warriors['id']}/players").json()
-    assert len(p_res) == 1
-    assert "Curry" in p_res[0]["full_name"]
+    assert report["teams_created"] == len(roster_map)
+    assert report["players_added"] == len(expected_rostered)
+    assert [p["player"] for p in report["players_not_found"]] == expected_missing
+    
+    # Verify Rosters
+    teams = [t for t in client.get("/teams").json() if t["league_id"] == league_id]
+    assert {t["name"] for t in teams} == set(roster_map)
+    
+    rostered = {
+        p["full_name"]
+        for t in teams
+        for p in client.get(f"/teams/{t['id']}/players").json()
+    }
+    assert rostered == expected_rostered
 
-def test_recommender(client):
+def test_recommender(client, seeded_players):
     """Test the lineup recommendation endpoint."""
-    # Ingest mock data
-    ingest_res = client.post("/ingest", json={"days": 5, "mock": True})
-    task = wait_for_task(client, ingest_res.json()["task_id"])
-    assert task["status"] == "completed"
-    
-    players = client.get("/players").json()
-    
-    if len(players) < 3:
+    if len(seeded_players) < 3:
         pytest.skip("Not enough players for recommender test")
 
-    ids = [p['id'] for p in players[:3]]
+    ids = [p['id'] for p in seeded_players[:3]]
     
     response = client.post("/recommend/lineup", json=ids)
     assert response.status_code == 200
@@ -222,6 +151,57 @@ def test_recommender(client):
     assert z_scores == sorted(z_scores, reverse=True)
 
 
+def test_trade_and_lineup_use_requested_season(client, seeded_players, create_league_scenario, db_session):
+    """Trade scoring reads the teams' league season unless one is given; lineup takes ?season=."""
+    a, b = seeded_players[0]['id'], seeded_players[1]['id']
+    league_id = create_league_scenario("Trade League", {"Team A": [a], "Team B": [b]})
+    team_a, team_b = (
+        t["id"] for t in sorted(client.get("/teams").json(), key=lambda t: t["name"])
+        if t["league_id"] == league_id
+    )
+    trade = {"team_a_id": team_a, "team_b_id": team_b, "players_to_b": [a], "players_to_a": [b]}
+    
+    assert client.post("/analyze/trade", json=trade).status_code == 200
+    
+    response = client.post("/analyze/trade", json={**trade, "season": "2023-24"})
+    assert response.status_code == 400
+    assert "2023-24" in response.json()["detail"]
+    
+    # A league in a season without stats scores against that season too
+    league = db_session.get(League, league_id)
+    league.season = "2023-24"
+    db_session.add(league)
+    db_session.commit()
+    assert client.post("/analyze/trade", json=trade).status_code == 400
+    
+    response = client.post("/recommend/lineup", params={"season": "2023-24"}, json=[a, b])
+    assert response.json() == {"message": "No data for these players"}
+
+
+def test_lineup_follows_season_totals(client, seeded_players, db_session):
+    """Cached Z-scores are dropped when totals change without new game rows."""
+    ids = [p['id'] for p in seeded_players[:3]]
+    
+    def lineup_points():
+        response = client.post("/recommend/lineup", json=ids)
+        assert response.status_code == 200
+        return {r['player_id']: r['PTS'] for r in response.json()}
+    
+    before = lineup_points()
+    totals = db_session.get(PlayerSeasonTotals, (ids[0], DEFAULT_SEASON))
+    try:
+        # Correct the totals in place, as an out-of-band fix would
+        totals.sum_pts += 10 * totals.games
+        db_session.add(totals)
+        db_session.commit()
+        corrected = lineup_points()
+        assert corrected[ids[0]] == pytest.approx(before[ids[0]] + 10)
+    finally:
+        rebuild_season_totals(db_session, DEFAULT_SEASON)
+    
+    assert lineup_points() == before
+
+
 def test_hybrid_sync(client):
     """Test the hybrid sync endpoint (NBA-only mode without ESPN credentials)."""
     # Create a league first
@@ -288,18 +268,12 @@ def test_espn_configuration(client):
     assert status["credentials_set"] == True
 
 
-def test_player_detail(client):
+def test_player_detail(client, seeded_players, players_by_id):
     """Test player detail endpoint with combined data."""
-    # Ingest mock data
-    ingest_res = client.post("/ingest", json={"days": 5, "mock": True})
-    task = wait_for_task(client, ingest_res.json()["task_id"])
-    assert task["status"] == "completed"
-    
-    players = client.get("/players").json()
-    if not players:
+    if not seeded_players:
         pytest.skip("No players found")
     
-    player_id = players[0]["id"]
+    player_id = seeded_players[0]["id"]
     
     # Get player detail
     response = client.get(f"/players/{player_id}")
@@ -307,6 +281,6 @@ def test_player_detail(client):
     
     detail = response.json()
     assert "id" in detail
-    assert "name" in detail
+    assert detail["name"] == players_by_id[player_id]["full_name"]
     assert "recent_averages" in detail
     assert "last_games" in detail
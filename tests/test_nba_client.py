@@ -0,0 +1,81 @@
+from datetime import date
+from src.ingestion import nba_client
+from src.ingestion.nba_client import NBAClient, SyncResult, TokenBucket, TTLCache
+import pandas as pd
+
+
+def test_token_bucket_allows_burst_then_paces(monkeypatch):
+    """Up to `capacity` acquires are free; the next one waits about 1/rate."""
+    sleeps = []
+    monkeypatch.setattr(nba_client.time, "sleep", sleeps.append)
+    bucket = TokenBucket(rate=10, capacity=3)
+    
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == []
+    
+    bucket.acquire()
+    assert len(sleeps) == 1
+    assert 0.05 < sleeps[0] <= 0.1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.get("missing") is None
+
+
+def test_parse_game_dates_accepts_each_format():
+    dates = NBAClient()._parse_game_dates(
+        pd.Series(["JAN 05, 2025", "2025-01-06", "01/07/2025", "not a date"])
+    )
+    
+    assert dates.iloc[:3].tolist() == [date(2025, 1, 5), date(2025, 1, 6), date(2025, 1, 7)]
+    assert pd.isna(dates.iloc[3])
+
+
+def gamelog_row(game_id: str, game_date: str = "JAN 05, 2025", **stats) -> dict:
+    row = {"Game_ID": game_id, "GAME_DATE": game_date, "MATCHUP": "AAA vs. BBB"}
+    row.update({col: 1 for col in nba_client.STAT_COLUMN_MAP})
+    row.update(stats)
+    return row
+
+
+def test_build_stat_records_rejects_bad_rows():
+    """Missing fields, negative stats, bad dates and repeated games are skipped with errors."""
+    df = pd.DataFrame([
+        gamelog_row("g1", PTS=30, FG3M=4),
+        gamelog_row("g2", REB=-1),
+        gamelog_row("g3", game_date="sometime"),
+        gamelog_row("g1", PTS=99),
+        {**gamelog_row("g4"), "MATCHUP": None},
+    ])
+    result = SyncResult(success=True)
+    
+    records = NBAClient()._build_stat_records(df, player_id=7, result=result)
+    
+    assert records == [{
+        "player_id": 7, "game_date": date(2025, 1, 5), "game_id": "g1", "matchup": "AAA vs. BBB",
+        "pts": 30, "reb": 1, "ast": 1, "stl": 1, "blk": 1, "fgm": 1, "fga": 1,
+        "ftm": 1, "fta": 1, "tpm": 4, "tov": 1,
+    }]
+    assert result.records_skipped == 4
+    errors = list(result.errors)
+    assert len(errors) == 3
+    assert any("Negative value for REB" in e for e in errors)
+    assert any("Missing required field: MATCHUP" in e for e in errors)
+    assert any("Invalid date format: sometime" in e for e in errors)
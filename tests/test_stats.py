@@ -0,0 +1,38 @@
+import numpy as np
+from src.core.stats import _zscore_kernel
+
+
+def test_zscore_kernel_matches_population_zscores():
+    """Sum/sum-of-squares moments match numpy's ddof=0 mean and std."""
+    rng = np.random.default_rng(0)
+    vals = rng.normal(20.0, 5.0, size=(50, 4))
+    
+    z, z_total = _zscore_kernel(vals)
+    
+    expected = (vals - vals.mean(axis=0)) / vals.std(axis=0, ddof=0)
+    np.testing.assert_allclose(z, expected, atol=1e-9)
+    np.testing.assert_allclose(z_total, expected.mean(axis=1), atol=1e-9)
+
+
+def test_zscore_kernel_constant_column_scores_zero():
+    """A column where every player is equal contributes 0, not NaN or noise."""
+    vals = np.array([
+        [1e6 + 0.1, 10.0],
+        [1e6 + 0.1, 20.0],
+        [1e6 + 0.1, 30.0],
+    ])
+    
+    z, z_total = _zscore_kernel(vals)
+    
+    assert np.all(z[:, 0] == 0.0)
+    np.testing.assert_allclose(z[:, 1], [-1.224744871, 0.0, 1.224744871])
+    np.testing.assert_allclose(z_total, z[:, 1] / 2)
+
+
+def test_zscore_kernel_single_row():
+    """One player has zero spread in every category, so all scores are 0."""
+    z, z_total = _zscore_kernel(np.array([[25.0, 7.0, 0.45]]))
+    
+    assert z.shape == (1, 3)
+    assert np.all(z == 0.0)
+    assert z_total.tolist() == [0.0]
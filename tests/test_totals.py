@@ -0,0 +1,70 @@
+from datetime import date
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from src.core.bulk import bulk_insert_playerstats
+from src.core.models import Player, PlayerSeasonTotals
+from src.core.totals import upsert_season_totals
+import pytest
+
+SEASON = "2024-25"
+
+
+@pytest.fixture
+def session():
+    """A private in-memory database, so writes here never touch the shared seed data."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            Player(id=1, nba_id=1, full_name="Player One"),
+            Player(id=2, nba_id=2, full_name="Player Two"),
+        ])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def stat_row(player_id: int, game_id: str, pts: int, reb: int = 0) -> dict:
+    return {
+        "player_id": player_id, "game_id": game_id, "game_date": date(2025, 1, 1),
+        "matchup": "AAA vs. BBB", "pts": pts, "reb": reb, "ast": 0, "stl": 0, "blk": 0,
+        "fgm": 0, "fga": 0, "ftm": 0, "fta": 0, "tpm": 0, "tov": 0,
+    }
+
+
+def get_totals(session: Session, player_id: int) -> PlayerSeasonTotals:
+    session.expire_all()
+    return session.exec(
+        select(PlayerSeasonTotals).where(
+            PlayerSeasonTotals.player_id == player_id,
+            PlayerSeasonTotals.season == SEASON,
+        )
+    ).one()
+
+
+def test_upsert_season_totals_accumulates(session):
+    """Repeated upserts add to the stored sums, pre-summed per player."""
+    assert upsert_season_totals(session, [stat_row(1, "g1", 10, 4), stat_row(1, "g2", 20)], SEASON) == 1
+    assert upsert_season_totals(session, [stat_row(1, "g3", 5), stat_row(2, "g3", 7)], SEASON) == 2
+    session.commit()
+    
+    totals = get_totals(session, 1)
+    assert (totals.games, totals.sum_pts, totals.sum_reb) == (3, 35, 4)
+    assert get_totals(session, 2).sum_pts == 7
+
+
+def test_bulk_insert_rerun_does_not_double_count(session):
+    """Re-ingesting stored games inserts nothing and leaves the totals unchanged."""
+    rows = [stat_row(1, "g1", 10), stat_row(1, "g2", 20), stat_row(2, "g1", 30)]
+    
+    assert bulk_insert_playerstats(session, rows, SEASON, chunk_size=2) == 3
+    assert bulk_insert_playerstats(session, rows, SEASON, chunk_size=2) == 0
+    
+    totals = get_totals(session, 1)
+    assert (totals.games, totals.sum_pts) == (2, 30)
+    
+    # Only the new game of a partially stored batch is folded in
+    assert bulk_insert_playerstats(session, [*rows, stat_row(1, "g3", 5)], SEASON) == 1
+    totals = get_totals(session, 1)
+    assert (totals.games, totals.sum_pts) == (3, 35)
+    assert get_totals(session, 2).games == 1